@@ -1,36 +1,34 @@
 import matplotlib.pyplot as plt
 import math
-import sympy as sp
+import numpy as np
+from systems import ExpressionError, fixed_step, format_state, parse_ode, read_state
 
 # -----------------------------------------------------
 # Function: Euler Method Implementation
 # -----------------------------------------------------
-def euler_method(f, x_start, y_start, step_size, steps):
+def euler_method(f, x_start, y_start, step_size, steps, every=1, final_only=False):
     """
     Implements Euler's Method for solving ODEs.
 
     Parameters:
     f          -> function representing dy/dx = f(x, y)
     x_start    -> initial x value
-    y_start    -> initial y value
+    y_start    -> initial y value (number, or NumPy array for a system)
     step_size  -> step size (h)
     steps      -> number of steps
+    every      -> keep every k-th step (and the last one)
+    final_only -> keep only the final state
 
     Returns:
-    xs -> list of x values
-    ys -> list of approximate y values
+    xs -> NumPy array of x values (x_start + i*h)
+    ys -> NumPy array of approximate y values
     """
-    xs, ys = [x_start], [y_start]
-
-    for _ in range(steps):
+    # One Euler step from (x, y)
+    def step(x, y, step_size):
         # Euler formula: y_{n+1} = y_n + h*f(x_n, y_n)
-        y_start += step_size * f(x_start, y_start)
-        x_start += step_size
-
-        xs.append(x_start)
-        ys.append(y_start)
+        return y + step_size * f(x, y)
 
-    return xs, ys
+    return fixed_step(step, y_start, x_start, step_size, steps, every, final_only)
 
 
 # -----------------------------------------------------
@@ -39,24 +37,23 @@ def euler_method(f, x_start, y_start, step_size, steps):
 ode_expr = input("Enter dy/dx as a function of x and y (e.g., x + y, x^2 - 3*y): ")
 ode_expr = ode_expr.replace("^", "**")  # allow ^ for power
 
-# Define symbolic variables
-x, y = sp.symbols("x y")
+# Order of the equation (higher orders are rewritten as a first-order system)
+order = int(input("Enter the order of the ODE (press Enter for 1): ") or 1)
 
-# Parse expression safely
 try:
-    sym_expr = sp.sympify(ode_expr)
-except sp.SympifyError:
+    f, m = parse_ode(ode_expr, order)
+except ExpressionError:
     print("Invalid expression. Please enter a valid function in x and y.")
     exit()
 
-# Convert to Python function
-f = sp.lambdify((x, y), sym_expr, modules=["math"])
-
 # -----------------------------------------------------
 # Step 2: Initial conditions & parameters
 # -----------------------------------------------------
 x_initial = float(input("Enter the initial x value: "))
-y_initial = float(input("Enter the initial y value: "))
+y_initial = read_state("Enter the initial y value (one value per component): ")
+if np.size(y_initial) != m:
+    print(f"Expected {m} initial value(s).")
+    exit()
 h = float(input("Enter the step size h: "))
 num_steps = int(input("Enter the number of steps: "))
 
@@ -72,7 +69,7 @@ print("\nEuler's Method Results:\n")
 print("step\t   X\t\t   Y (Euler)")
 print("-" * 34)
 for i in range(len(x_vals)):
-    print(f"{i}\t {x_vals[i]:.6f}\t {y_vals[i]:.6f}")
+    print(f"{i}\t {x_vals[i]:.6f}\t {format_state(y_vals[i], 6)}")
 
 # -----------------------------------------------------
 # Step 5: Plot Graph
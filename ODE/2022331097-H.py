@@ -1,49 +1,40 @@
 import matplotlib.pyplot as plt
-import sympy as sp
 import math
+import numpy as np
+from systems import ExpressionError, fixed_step, format_state, parse_ode, read_state
 
 # -----------------------------------------------------
 # Function: Heun's Method Implementation
 # -----------------------------------------------------
-def heun_method(f, x_initial, y_initial, step_size, num_steps):
+def heun_method(f, x_initial, y_initial, step_size, num_steps, every=1, final_only=False):
     """
     Implements Heun's Method (Improved Euler) for solving ODEs.
 
     Parameters:
     f          -> function representing dy/dx = f(x, y)
     x_initial  -> initial x value
-    y_initial  -> initial y value
+    y_initial  -> initial y value (number, or NumPy array for a system)
     step_size  -> step size (h)
     num_steps  -> number of steps
+    every      -> keep every k-th step (and the last one)
+    final_only -> keep only the final state
 
     Returns:
-    x_values -> list of x values
-    y_values -> list of approximate y values
+    x_values -> NumPy array of x values (x_initial + i*h)
+    y_values -> NumPy array of approximate y values
     """
-    x_values = [x_initial]  # list to store x values
-    y_values = [y_initial]  # list to store y values
-
-    x_current = x_initial
-    y_current = y_initial
-
-    # Loop through each step
-    for _ in range(num_steps):
+    # One Heun step from (x_current, y_current)
+    def step(x_current, y_current, step_size):
         # Step 1: Predictor (Euler step)
         y_predictor = y_current + step_size * f(x_current, y_current)
-        
+
         # Step 2: Corrector (average slope)
         average_slope = (f(x_current, y_current) + f(x_current + step_size, y_predictor)) / 2
 
         # Step 3: Update y using average slope
-        y_current += step_size * average_slope
-        # Step 4: Update x
-        x_current += step_size
+        return y_current + step_size * average_slope
 
-        # Append current values to lists
-        x_values.append(x_current)
-        y_values.append(y_current)
-
-    return x_values, y_values
+    return fixed_step(step, y_initial, x_initial, step_size, num_steps, every, final_only)
 
 # -----------------------------------------------------
 # Step 1: Take ODE input safely using SymPy
@@ -51,24 +42,23 @@ def heun_method(f, x_initial, y_initial, step_size, num_steps):
 function_expression = input("Enter dy/dx as a polynomial in x and y (e.g., x + y, x**2 - 3*y) : ")
 function_expression = function_expression.replace("^", "**")  # allow ^ for power
 
-# Define symbolic variables
-x, y = sp.symbols("x y")
+# Order of the equation (higher orders are rewritten as a first-order system)
+order = int(input("Enter the order of the ODE (press Enter for 1): ") or 1)
 
-# Parse expression safely using sympy
 try:
-    sym_expr = sp.sympify(function_expression)
-except sp.SympifyError:
+    f, m = parse_ode(function_expression, order)
+except ExpressionError:
     print("Invalid expression. Please enter a valid polynomial in x and y.")
     exit()
 
-# Convert symbolic expression to a callable Python function
-f = sp.lambdify((x, y), sym_expr, modules=["math"])
-
 # -----------------------------------------------------
 # Step 2: Initial conditions & parameters
 # -----------------------------------------------------
 x_initial = float(input("Enter initial x (x0): "))
-y_initial = float(input("Enter initial y (y0): "))
+y_initial = read_state("Enter initial y (y0) (one value per component): ")
+if np.size(y_initial) != m:
+    print(f"Expected {m} initial value(s).")
+    exit()
 step_size = float(input("Enter step size (h): "))
 num_steps = int(input("Enter number of steps (n): "))
 
@@ -84,7 +74,7 @@ print("\nHeun's Method Results:\n")
 print("Step\t   X\t\t   Y")
 print("-" * 34)
 for step in range(len(x_values)):
-    print(f"{step}\t {x_values[step]:.6f}\t {y_values[step]:.6f}")
+    print(f"{step}\t {x_values[step]:.6f}\t {format_state(y_values[step], 6)}")
 
 # -----------------------------------------------------
 # Step 5: Plot Graph
@@ -1,47 +1,40 @@
 import matplotlib.pyplot as plt
-import sympy as sp
 import math
+import numpy as np
+from systems import ExpressionError, fixed_step, format_state, parse_ode, read_state
 
 # -----------------------------------------------------
 # Function: Midpoint Method Implementation
 # -----------------------------------------------------
-def midpoint_method(f, x_initial, y_initial, step_size, num_steps):
+def midpoint_method(f, x_initial, y_initial, step_size, num_steps, every=1, final_only=False):
     """
     Implements the Midpoint Method (second-order Runge-Kutta) for solving ODEs.
 
     Parameters:
     f          -> function representing dy/dx = f(x, y)
     x_initial  -> initial x value
-    y_initial  -> initial y value
+    y_initial  -> initial y value (number, or NumPy array for a system)
     step_size  -> step size (h)
     num_steps  -> number of steps
+    every      -> keep every k-th step (and the last one)
+    final_only -> keep only the final state
 
     Returns:
-    x_values -> list of x values
-    y_values -> list of approximate y values
+    x_values -> NumPy array of x values (x_initial + i*h)
+    y_values -> NumPy array of approximate y values
     """
-    x_values, y_values = [x_initial], [y_initial]
-
-    x_current = x_initial
-    y_current = y_initial
-
-    for _ in range(num_steps):
+    # One Midpoint step from (x_current, y_current)
+    def step(x_current, y_current, step_size):
         # Step 1: Calculate slope at beginning of interval
         k1 = f(x_current, y_current)
-        
+
         # Step 2: Estimate slope at midpoint
         k2 = f(x_current + step_size / 2, y_current + step_size * k1 / 2)
-        
-        # Step 3: Update y using slope at midpoint
-        y_current += step_size * k2
-        # Step 4: Update x
-        x_current += step_size
 
-        # Store current values
-        x_values.append(x_current)
-        y_values.append(y_current)
+        # Step 3: Update y using slope at midpoint
+        return y_current + step_size * k2
 
-    return x_values, y_values
+    return fixed_step(step, y_initial, x_initial, step_size, num_steps, every, final_only)
 
 # -----------------------------------------------------
 # Step 1: Input function safely using SymPy
@@ -50,23 +43,23 @@ print("Use only polynomials in x and y (e.g., x + y, x**2 - 3*y) :")
 func_str = input("Enter dy/dx as a polynomial in x and y: ")
 func_str = func_str.replace("^", "**")
 
-# Define symbolic variables
-x, y = sp.symbols("x y")
+# Order of the equation (higher orders are rewritten as a first-order system)
+order = int(input("Enter the order of the ODE (press Enter for 1): ") or 1)
 
 try:
-    sym_expr = sp.sympify(func_str)
-except sp.SympifyError:
+    f, m = parse_ode(func_str, order)
+except ExpressionError:
     print("Invalid expression. Please enter a valid polynomial in x and y.")
     exit()
 
-# Convert symbolic expression to Python function
-f = sp.lambdify((x, y), sym_expr, modules=["math"])
-
 # -----------------------------------------------------
 # Step 2: Initial conditions & parameters
 # -----------------------------------------------------
 x_initial = float(input("Enter initial x (x0): "))
-y_initial = float(input("Enter initial y (y0): "))
+y_initial = read_state("Enter initial y (y0) (one value per component): ")
+if np.size(y_initial) != m:
+    print(f"Expected {m} initial value(s).")
+    exit()
 step_size = float(input("Enter step size (h): "))
 num_steps = int(input("Enter number of steps (n): "))
 
@@ -82,7 +75,7 @@ print("\nMidpoint Method Results:\n")
 print("Step\t   X\t\t   Y")
 print("-" * 34)
 for step in range(len(x_values)):
-    print(f"{step}\t {x_values[step]:.6f}\t {y_values[step]:.6f}")
+    print(f"{step}\t {x_values[step]:.6f}\t {format_state(y_values[step], 6)}")
 
 # -----------------------------------------------------
 # Step 5: Plot Graph
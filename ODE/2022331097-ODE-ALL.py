@@ -1,93 +1,296 @@
 import matplotlib.pyplot as plt
-import sympy as sp
 import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from systems import (ExpressionError, as_state, fixed_step, format_state, parse_ode,
+                     read_state, sample_grid, state_array, step_count)
 
 # -----------------------------------------------------
-# Euler Method
+# Fixed-step methods: one driver, one slope per method
 # -----------------------------------------------------
-def euler_method(f, y0, x0, xf, h):
+# Slope of one step of each method (also used by the ensemble and fused runs)
+METHOD_SLOPES = {
+    "euler": lambda f, x, y, h: f(x, y),
+    "heun": lambda f, x, y, h: _heun_slope(f, x, y, h, f(x, y)),
+    "midpoint": lambda f, x, y, h: f(x + 0.5 * h, y + 0.5 * f(x, y) * h),
+    "ralston": lambda f, x, y, h: _ralston_slope(f, x, y, h, f(x, y)),
+}
+
+
+def _heun_slope(f, x, y, h, k1):
+    return 0.5 * (k1 + f(x + h, y + k1 * h))
+
+
+def _ralston_slope(f, x, y, h, k1):
+    return 1/3 * k1 + 2/3 * f(x + 0.75 * h, y + 0.75 * k1 * h)
+
+
+def fixed_step_method(method, f, y0, x0, xf, h, every=1, final_only=False):
     """
-    Euler's Method for solving ODE y' = f(x, y)
-    Returns lists of x and y values
+    Solves y' = f(x, y) with a fixed-step method from METHOD_SLOPES
+    y0 may be a number or a NumPy state vector (system of ODEs)
+    x_i = x0 + i*h; keeps every k-th point (every) or only the last one (final_only)
+    Returns NumPy arrays of x and y values
     """
-    x, y = x0, y0
-    x_vals, y_vals = [x], [y]
+    slope = METHOD_SLOPES[method]
 
-    while x < xf:
-        step = min(h, xf - x)  # avoid overshooting final x
-        y += f(x, y) * step    # Euler formula
-        x += step
-        x_vals.append(x)
-        y_vals.append(y)
+    def step(x, y, h):
+        return y + slope(f, x, y, h) * h    # one array update for systems
+
+    return fixed_step(step, y0, x0, h, step_count(x0, xf, h), every, final_only, xf)
+
+
+# Euler Method
+def euler_method(f, y0, x0, xf, h, every=1, final_only=False):
+    return fixed_step_method("euler", f, y0, x0, xf, h, every, final_only)
 
-    return x_vals, y_vals
 
-# -----------------------------------------------------
 # Heun Method (Improved Euler)
+def heun_method(f, y0, x0, xf, h, every=1, final_only=False):
+    return fixed_step_method("heun", f, y0, x0, xf, h, every, final_only)
+
+
+# Midpoint Method (2nd-order RK)
+def midpoint_method(f, y0, x0, xf, h, every=1, final_only=False):
+    return fixed_step_method("midpoint", f, y0, x0, xf, h, every, final_only)
+
+
+# Ralston Method (2nd-order RK with weighted slopes)
+def ralston_method(f, y0, x0, xf, h, every=1, final_only=False):
+    return fixed_step_method("ralston", f, y0, x0, xf, h, every, final_only)
+
 # -----------------------------------------------------
-def heun_method(f, y0, x0, xf, h):
-    x, y = x0, y0
-    x_vals, y_vals = [x], [y]
+# Adaptive step size with embedded Runge-Kutta pairs
+# -----------------------------------------------------
+# Butcher tableaux: c, a (rows below the diagonal), b (weights of the solution
+# that is kept), b_low (weights of the embedded lower-order solution), the
+# lower order, and FSAL (last stage = f at the new point, reused as next k1)
+EMBEDDED_PAIRS = {
+    "heun_euler": dict(c=[0, 1], a=[[], [1]],
+                       b=[1/2, 1/2], b_low=[1, 0], order=1, fsal=False),
+    "bogacki_shampine": dict(c=[0, 1/2, 3/4, 1],
+                             a=[[], [1/2], [0, 3/4], [2/9, 1/3, 4/9]],
+                             b=[2/9, 1/3, 4/9, 0], b_low=[7/24, 1/4, 1/3, 1/8],
+                             order=2, fsal=True),
+    "dormand_prince": dict(c=[0, 1/5, 3/10, 4/5, 8/9, 1, 1],
+                           a=[[], [1/5], [3/40, 9/40], [44/45, -56/15, 32/9],
+                              [19372/6561, -25360/2187, 64448/6561, -212/729],
+                              [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+                              [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84]],
+                           b=[35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0],
+                           b_low=[5179/57600, 0, 7571/16695, 393/640,
+                                  -92097/339200, 187/2100, 1/40],
+                           order=4, fsal=True),
+}
+SAFETY = 0.9                    # Step size safety factor
+MIN_FACTOR, MAX_FACTOR = 0.2, 5.0
+MAX_STEPS = 100000              # Accepted + rejected steps before giving up
+
+
+def adaptive_method(f, y0, x0, xf, h, pair="dormand_prince", rtol=1e-6, atol=1e-9, stats=None,
+                    h_min=0.0, max_steps=MAX_STEPS):
+    """
+    Adaptive Runge-Kutta method for y' = f(x, y) with an embedded pair
+    (heun_euler 2/1, bogacki_shampine 3/2 or dormand_prince 5/4)
+    h is the initial step; each step keeps the local error estimate below
+    atol + rtol * |y| (RMS over the components of a system)
+    stats -> optional dict, filled with accepted / rejected steps and RHS evaluations
+    Raises ValueError when the step falls below max(h_min, 16 * eps * |x|)
+    (e.g. a solution blowing up) or after max_steps attempted steps
+    Returns NumPy arrays of the accepted x and y values (y has shape
+    (steps,) or (steps, m) for a system), like ralston_method
+    """
+    tab = EMBEDDED_PAIRS[pair]
+    c, a, b = tab["c"], tab["a"], tab["b"]
+    e = [bi - bl for bi, bl in zip(b, tab["b_low"])]    # error estimate weights
+    exponent = -1 / (tab["order"] + 1)
+
+    x, y = x0, as_state(y0)
+    x_vals, y_vals = [x], [y]           # step count unknown in advance
+    accepted = rejected = 0
+    k1 = f(x, y)
+    evaluations = 1
 
     while x < xf:
         step = min(h, xf - x)
-        k1 = f(x, y)
-        k2 = f(x + step, y + k1 * step)
-        y += 0.5 * (k1 + k2) * step
-        x += step
-        x_vals.append(x)
-        y_vals.append(y)
+        if step < xf - x and step < max(h_min, 16 * np.finfo(float).eps * abs(x)):
+            _adaptive_stats(stats, accepted, rejected, evaluations)
+            raise ValueError(f"Step size underflow at x = {x}: the solution may blow up.")
+        if accepted + rejected >= max_steps:
+            _adaptive_stats(stats, accepted, rejected, evaluations)
+            raise ValueError(f"No convergence in {max_steps} steps (reached x = {x}).")
+        k = [k1]
+        for i in range(1, len(c)):
+            yi = y + step * sum((aij * kj for aij, kj in zip(a[i], k) if aij), 0.0)
+            k.append(f(x + c[i] * step, yi))
+        evaluations += len(c) - 1
 
-    return x_vals, y_vals
+        y_new = y + step * sum((bi * ki for bi, ki in zip(b, k) if bi), 0.0)
+        err = step * sum((ei * ki for ei, ki in zip(e, k) if ei), 0.0)
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        err_norm = float(np.sqrt(np.mean(np.square(err / scale))))
+
+        if not np.isfinite(err_norm):            # Overflow / NaN: shrink as far as allowed
+            rejected += 1
+            h = step * MIN_FACTOR
+            continue
+        if err_norm <= 1.0:
+            x = xf if step == xf - x else x + step
+            y = y_new
+            x_vals.append(x)
+            y_vals.append(y)
+            accepted += 1
+            if tab["fsal"]:
+                k1 = k[-1]                  # f(x_new, y_new) is the last stage
+            else:
+                k1 = f(x, y)
+                evaluations += 1
+            factor = MAX_FACTOR if err_norm == 0 else min(MAX_FACTOR, SAFETY * err_norm**exponent)
+        else:
+            rejected += 1
+            factor = max(MIN_FACTOR, SAFETY * err_norm**exponent)
+        h = step * factor
+
+    _adaptive_stats(stats, accepted, rejected, evaluations)
+    return np.asarray(x_vals), np.asarray(y_vals)
+
+
+def _adaptive_stats(stats, accepted, rejected, evaluations):
+    if stats is not None:
+        stats.update(accepted=accepted, rejected=rejected, evaluations=evaluations)
 
 # -----------------------------------------------------
-# Midpoint Method (2nd-order RK)
+# Ensemble integration (many initial values in one pass)
 # -----------------------------------------------------
-def midpoint_method(f, y0, x0, xf, h):
-    x, y = x0, y0
-    x_vals, y_vals = [x], [y]
+def ensemble_method(f, y0, x0, xf, h, method="heun", stop=None):
+    """
+    Advances many trajectories of y' = f(x, y) together with array operations
+    f must accept NumPy arrays (parse_ode(..., vectorized=True))
+    y0 has shape (ensemble,), or (m, ensemble) for a system of m equations;
+    x0 and xf are numbers or arrays of shape (ensemble,)
+    stop(x, y) -> optional boolean mask of members to stop after a step
+    Finished or stopped members are masked out and keep their last value
+    Returns x values (steps, ensemble) and y values (steps, [m,] ensemble)
+    """
+    slope = METHOD_SLOPES[method]
+    y = np.array(y0, dtype=float)
+    size = y.shape[-1]
+    x_start = np.broadcast_to(np.asarray(x0, dtype=float), (size,))
+    x_end = np.broadcast_to(np.asarray(xf, dtype=float), (size,))
+    n_steps = np.ceil(np.round((x_end - x_start) / h, 9)).astype(int)   # steps of every member
+    total = int(n_steps.max(initial=0))
 
-    while x < xf:
-        step = min(h, xf - x)
-        k1 = f(x, y)
-        k2 = f(x + 0.5 * step, y + 0.5 * k1 * step)
-        y += k2 * step
-        x += step
-        x_vals.append(x)
-        y_vals.append(y)
+    x = x_start.copy()
+    x_vals = np.empty((total + 1, size))
+    y_vals = np.empty((total + 1,) + y.shape)
+    x_vals[0], y_vals[0] = x, y
+    active = n_steps > 0
+
+    i = 0
+    while i < total and active.any():
+        idx = slice(None) if active.all() else np.flatnonzero(active)
+        xa, ya = x[idx], y[..., idx]
+        step = np.minimum(h, x_end[idx] - xa)                 # last step ends exactly at xf
+        y[..., idx] = ya + slope(f, xa, ya, step) * step
+        i += 1
+        x[idx] = np.where(n_steps[idx] == i, x_end[idx], x_start[idx] + i * h)
+        active &= n_steps > i
+        if stop is not None:
+            active &= ~np.asarray(stop(x, y), dtype=bool)
+        x_vals[i], y_vals[i] = x, y
 
-    return x_vals, y_vals
+    return x_vals[:i + 1], y_vals[:i + 1]
 
 # -----------------------------------------------------
-# Ralston Method (2nd-order RK with weighted slopes)
+# Fused comparison of the four methods on one grid
 # -----------------------------------------------------
-def ralston_method(f, y0, x0, xf, h):
-    x, y = x0, y0
-    x_vals, y_vals = [x], [y]
+FUSED_METHODS = ("Euler", "Heun", "Midpoint", "Ralston")
 
-    while x < xf:
-        step = min(h, xf - x)
-        k1 = f(x, y)
-        k2 = f(x + 0.75 * step, y + 0.75 * k1 * step)
-        y += (1/3 * k1 + 2/3 * k2) * step
-        x += step
-        x_vals.append(x)
-        y_vals.append(y)
 
-    return x_vals, y_vals
+def fused_methods(f, y0, x0, xf, h, every=1, final_only=False):
+    """
+    Runs Euler, Heun, Midpoint and Ralston together over the grid x0 + i*h.
+    f(x, y) values are shared between methods whenever they ask for the same
+    (x, y), e.g. k1 at the start and Heun's predictor = Euler's next state.
+    Returns x values, a dict of y values per method and a dict of stats per
+    method (RHS evaluations, reused evaluations, wall time in seconds)
+    """
+    y = as_state(y0)
+    n_steps = step_count(x0, xf, h)
+    keep, x_vals = sample_grid(x0, h, n_steps, every, final_only, xf)
+    states = {name: y for name in FUSED_METHODS}
+    y_vals = {name: state_array(keep, y) for name in FUSED_METHODS}
+    stats = {name: {"evaluations": 0, "reused": 0, "time": 0.0} for name in FUSED_METHODS}
+    memo = {}                               # (x, y) -> f(x, y) at the current grid point
+
+    def rhs_for(name):
+        def rhs(x, y):
+            key = (x, y.tobytes() if isinstance(y, np.ndarray) else y)
+            if key in memo:
+                stats[name]["reused"] += 1
+                return memo[key]
+            stats[name]["evaluations"] += 1
+            memo[key] = value = f(x, y)
+            return value
+        return rhs
+    rhs = {name: rhs_for(name) for name in FUSED_METHODS}
+
+    for i in range(n_steps):
+        x = x0 + i * h
+        step = h if i < n_steps - 1 else xf - x    # last step ends exactly at xf
+        for name in FUSED_METHODS:
+            start = time.perf_counter()
+            y = states[name]
+            if i in keep:
+                y_vals[name][i // every] = y
+            states[name] = y + METHOD_SLOPES[name.lower()](rhs[name], x, y, step) * step
+            stats[name]["time"] += time.perf_counter() - start
+        x_next = x + step
+        memo = {key: value for key, value in memo.items() if key[0] == x_next}
+
+    for name in FUSED_METHODS:
+        y_vals[name][-1] = states[name]
+    return x_vals, y_vals, stats
+
+
+# Worker for one step size; f is rebuilt from its source text in a process pool
+def _fused_final(job):
+    f, y0, x0, xf, h = job
+    if isinstance(f, tuple):
+        f = parse_ode(*f)[0]
+    _, y_vals, stats = fused_methods(f, y0, x0, xf, h, final_only=True)
+    return {name: y_vals[name][-1] for name in FUSED_METHODS}, stats
 
 # -----------------------------------------------------
 # Compare step sizes
 # -----------------------------------------------------
-def compare_step_sizes(f, y0, x0, xf, step_sizes):
+def compare_step_sizes(f, y0, x0, xf, step_sizes, source=None, processes=None):
+    """
+    Final values of the four methods for each step size, plus RHS
+    evaluations and wall time per method. With source = (text, order) of
+    the ODE the step sizes run in parallel in a process pool
+    """
+    jobs = [(source or f, y0, x0, xf, h) for h in step_sizes]
+    if source is not None and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_fused_final, jobs))
+    else:
+        results = [_fused_final(job) for job in jobs]
+
     print("\nPerformance Comparison Across Step Sizes:")
     print(f"{'h':<8}{'Euler':<12}{'Heun':<12}{'Midpoint':<12}{'Ralston':<12}")
-    for h in step_sizes:
-        e = euler_method(f, y0, x0, xf, h)[1][-1]       # last y value
-        hn = heun_method(f, y0, x0, xf, h)[1][-1]
-        mp = midpoint_method(f, y0, x0, xf, h)[1][-1]
-        rl = ralston_method(f, y0, x0, xf, h)[1][-1]
-        print(f"{h:<8.5f}{e:<12.5f}{hn:<12.5f}{mp:<12.5f}{rl:<12.5f}")
+    for h, (finals, _) in zip(step_sizes, results):
+        values = "".join(f"{format_state(finals[name]):<12} " for name in FUSED_METHODS)
+        print(f"{h:<8.5f}{values}")
+
+    print("\nRHS evaluations (reused) and wall time:")
+    print(f"{'h':<8}" + "".join(f"{name:<24}" for name in FUSED_METHODS))
+    for h, (_, stats) in zip(step_sizes, results):
+        cells = "".join(f"{s['evaluations']:>7} ({s['reused']:>3}) {1000 * s['time']:8.2f} ms "
+                        for s in (stats[name] for name in FUSED_METHODS))
+        print(f"{h:<8.5f}{cells}")
 
 # -----------------------------------------------------
 # Main function
@@ -95,40 +298,42 @@ def compare_step_sizes(f, y0, x0, xf, step_sizes):
 def main():
     try:
         # Step 1: Input ODE safely
-        func_str = input("Enter the ODE function f(x, y) (polynomial in x and y): ")
+        # (a system is entered as "y1; -y0" with components y0, y1, ...;
+        #  an n-th order equation as y^(n) = g with yk = k-th derivative)
+        func_str = input("Enter the ODE function f(x, y) (polynomial in x and y, ';' between equations): ")
+        order = int(input("Enter the order of the ODE (press Enter for 1): ") or 1)
 
         # Step 2: Input initial conditions and parameters
         x0 = float(input("Enter initial x0: "))
-        y0 = float(input("Enter initial y0: "))
+        y0 = read_state("Enter initial y0 (one value per component): ")
         xf = float(input("Enter final xf: "))
         h = float(input("Enter step size h: "))
 
         # Step 3: Convert string to safe function using SymPy
-        x_sym, y_sym = sp.symbols("x y")
         try:
-            sym_expr = sp.sympify(func_str.replace("^", "**"))
-        except sp.SympifyError:
+            f, m = parse_ode(func_str, order)
+        except ExpressionError:
             print("Invalid expression. Please enter a polynomial in x and y.")
             return
+        if np.size(y0) != m:
+            print(f"Expected {m} initial value(s).")
+            return
 
-        f = sp.lambdify((x_sym, y_sym), sym_expr, modules=["math"])
-
-        # Step 4: Solve ODE using all four methods
-        x_e, y_e = euler_method(f, y0, x0, xf, h)
-        x_h, y_h = heun_method(f, y0, x0, xf, h)
-        x_m, y_m = midpoint_method(f, y0, x0, xf, h)
-        x_r, y_r = ralston_method(f, y0, x0, xf, h)
+        # Step 4: Solve ODE using all four methods (one fused sweep)
+        x_vals, y_vals, _ = fused_methods(f, y0, x0, xf, h)
+        x_e = x_h = x_m = x_r = x_vals
+        y_e, y_h, y_m, y_r = (y_vals[name] for name in FUSED_METHODS)
 
         # Step 5: Print results at final x
         print(f"\nResults at x = {xf}:")
-        print(f"Euler's Method:   {y_e[-1]:.5f}")
-        print(f"Heun's Method:    {y_h[-1]:.5f}")
-        print(f"Midpoint Method:  {y_m[-1]:.5f}")
-        print(f"Ralston's Method: {y_r[-1]:.5f}")
+        print(f"Euler's Method:   {format_state(y_e[-1])}")
+        print(f"Heun's Method:    {format_state(y_h[-1])}")
+        print(f"Midpoint Method:  {format_state(y_m[-1])}")
+        print(f"Ralston's Method: {format_state(y_r[-1])}")
 
         # Step 6: Compare performance across multiple step sizes
         step_sizes = [h / (2**i) for i in range(5)]
-        compare_step_sizes(f, y0, x0, xf, step_sizes)
+        compare_step_sizes(f, y0, x0, xf, step_sizes, source=(func_str, order))
 
         # Step 7: Plot all methods
         plt.figure(figsize=(10, 6))
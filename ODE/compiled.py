@@ -0,0 +1,196 @@
+import hashlib
+import json
+import math
+import os
+import re
+
+import numpy as np
+
+try:                                    # Optional: multithreaded array expressions
+    import numexpr
+except ImportError:
+    numexpr = None
+
+try:                                    # Optional: JIT-compiled right-hand sides
+    import numba
+except ImportError:
+    numba = None
+
+# -----------------------------------------------------
+# Compiled right-hand sides: SymPy -> CSE -> Python source, cached
+# -----------------------------------------------------
+# The generated source is stored on disk, so a repeated run with the same
+# equation rebuilds f(x, y) with exec() and never imports or calls SymPy.
+
+CACHE_DIR = os.environ.get("ODE_RHS_CACHE",
+                           os.path.join(os.path.expanduser("~"), ".cache", "ode-rhs"))
+CODE_VERSION = 1                        # Bump when the generated code changes
+BACKENDS = ("numpy", "numexpr", "numba")
+
+_compiled = {}                          # (key, vectorized, backend) -> (f, m)
+
+
+class ExpressionError(ValueError):
+    """The equation text could not be parsed (wraps SymPy's SympifyError)."""
+
+
+# Expressions of an equation as typed (blanks kept, they separate tokens), ^ as **
+def _parts(text):
+    return [p.strip().replace("^", "**") for p in text.split(";") if p.strip()]
+
+
+# Cache key of an equation: runs of blanks collapsed to one, so "x y" stays invalid
+def normalize(text, order=1):
+    return f"{order}|" + ";".join(re.sub(r"\s+", " ", p) for p in _parts(text))
+
+
+def _ode_expressions(parts, order):
+    """
+    SymPy expressions of the right-hand side.
+
+    Returns:
+    args   -> argument names of the generated function after x
+    exprs  -> list of expressions, one per state component
+    scalar -> True for a single first-order equation in x and y
+    """
+    import sympy as sp                  # Only needed when the cache misses
+
+    if len(parts) == 1 and order == 1:
+        return ["y"], [sp.sympify(parts[0])], True
+
+    if len(parts) > 1 and order != 1:
+        raise sp.SympifyError("A system must be written in first-order form.")
+    m = len(parts) if order == 1 else order
+    ys = sp.symbols(f"y0:{m}")
+    exprs = [sp.sympify(p).subs(sp.Symbol("y"), ys[0]) for p in parts]
+    if order > 1:
+        exprs = list(ys[1:]) + exprs    # y0' = y1, y1' = y2, ..., y(n-1)' = g
+    return [str(s) for s in ys], exprs, False
+
+
+def generate_source(text, order=1, printer="numpy"):
+    """
+    Python source of core(x, y...) with common subexpressions computed once.
+
+    Parameters:
+    printer -> "math" (fast on Python floats), "numpy" (works on arrays)
+               or "numexpr" (each expression evaluated by numexpr)
+
+    Returns:
+    source  -> text defining core(x, y) for a scalar equation, otherwise
+               core(x, y0, ..., y(m-1)) returning a tuple of m values
+    m       -> number of state components
+    scalar  -> True for a single first-order equation
+    """
+    import sympy as sp
+    from sympy.printing.lambdarepr import NumExprPrinter
+    from sympy.printing.numpy import NumPyPrinter
+    from sympy.printing.pycode import PythonCodePrinter
+
+    args, exprs, scalar = _ode_expressions(_parts(text), order)
+    replacements, reduced = sp.cse(exprs, symbols=sp.numbered_symbols("_c"))
+    code = {"math": PythonCodePrinter, "numpy": NumPyPrinter,
+            "numexpr": NumExprPrinter}[printer]()
+
+    lines = [f"def core(x, {', '.join(args)}):"]
+    lines += [f"    {name} = {code.doprint(expr)}" for name, expr in replacements]
+    values = [code.doprint(expr) for expr in reduced]
+    lines.append(f"    return {values[0] if scalar else '(' + ', '.join(values) + ',)'}")
+    return "\n".join(lines) + "\n", len(exprs), scalar
+
+
+def _cache_path(key, printer):
+    digest = hashlib.sha256(json.dumps([CODE_VERSION, key, printer]).encode()).hexdigest()
+    return os.path.join(CACHE_DIR, digest[:32] + ".json")
+
+
+# Generated source from the disk cache, or None
+def _load(path, key):
+    try:
+        with open(path) as fh:
+            entry = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get("key") == key else None
+
+
+# A cache that cannot be written (read-only home, ...) only costs speed
+def _store(path, entry):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(path + ".tmp", "w") as fh:
+            json.dump(entry, fh)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass
+
+
+# f(x, y) around the generated core, with the same conventions as parse_ode
+def _wrap(core, scalar, vectorized):
+    if scalar and not vectorized:
+        return core
+    if scalar:
+        # Constant right-hand sides are broadcast to the shape of y
+        def f1(x, y):
+            return np.broadcast_arrays(core(x, y), y)[0]
+        return f1
+
+    # One call evaluates every component; constant components are broadcast
+    def f(x, y):
+        y = np.asarray(y, dtype=float)
+        return np.array(np.broadcast_arrays(*core(x, *y), y[0])[:-1], dtype=float)
+    return f
+
+
+def compile_ode(text, order=1, vectorized=False, backend="numpy"):
+    """
+    Compiled f(x, y) for the equation typed by the user (see parse_ode).
+
+    Parameters:
+    text, order -> equation and its order, as for parse_ode
+    vectorized  -> generate NumPy code for a single equation too, so that
+                   f(x, y) accepts arrays (systems always use NumPy)
+    backend     -> "numpy", "numexpr" (array expressions evaluated by
+                   numexpr) or "numba" (core compiled with numba.njit)
+
+    Returns (f, m). Results are cached in memory and, as generated source,
+    in CACHE_DIR, keyed by the normalized equation.
+
+    Raises ExpressionError (a ValueError) for invalid input, ValueError for
+    an unknown or uninstalled backend.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}; expected one of {BACKENDS}.")
+    if (backend == "numexpr" and numexpr is None) or (backend == "numba" and numba is None):
+        raise ValueError(f"The {backend} backend is not installed.")
+
+    key = normalize(text, order)
+    if (key, vectorized, backend) in _compiled:
+        return _compiled[key, vectorized, backend]
+
+    # Scalar equations on Python floats run fastest with the math module
+    single = order == 1 and ";" not in key
+    printer = "math" if single and not vectorized else "numpy"
+    if printer == "numpy" and backend == "numexpr":
+        printer = "numexpr"
+
+    path = _cache_path(key, printer)
+    entry = _load(path, key)
+    if entry is None:
+        from sympy import SympifyError
+        try:
+            source, m, scalar = generate_source(text, order, printer)
+        except SympifyError as error:
+            raise ExpressionError(str(error)) from error
+        entry = {"key": key, "printer": printer, "m": m, "scalar": scalar, "source": source}
+        _store(path, entry)
+
+    namespace = {"math": math, "numpy": np, "numexpr": numexpr}
+    exec(compile(entry["source"], f"<ode rhs {key}>", "exec"), namespace)
+    core = namespace["core"]
+    if backend == "numba":
+        core = numba.njit(core)
+
+    result = _wrap(core, entry["scalar"], vectorized), entry["m"]
+    _compiled[key, vectorized, backend] = result
+    return result
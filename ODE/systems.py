@@ -0,0 +1,119 @@
+import math
+
+import numpy as np
+from compiled import ExpressionError, compile_ode
+
+__all__ = ["ExpressionError", "as_state", "parse_ode", "step_count", "sample_grid",
+           "state_array", "fixed_step", "read_state", "format_state"]
+
+# -----------------------------------------------------
+# Front end for ODE systems y' = f(x, y) with a state vector y
+# -----------------------------------------------------
+
+
+# Scalar initial values stay Python floats, anything else becomes a float array
+def as_state(y0):
+    if np.ndim(y0) == 0:
+        return float(y0)
+    return np.array(y0, dtype=float)
+
+
+def parse_ode(text, order=1, vectorized=False, backend="numpy"):
+    """
+    Builds f(x, y) for y' = f(x, y) from the text typed by the user.
+
+    Parameters:
+    text   -> one expression in x and y (scalar ODE), or several separated
+              by ';' (a system, components named y0, y1, ...; y means y0)
+    order  -> order n of a single equation y^(n) = g(x, y0, ..., y(n-1)),
+              where yk is the k-th derivative; it is rewritten as the first
+              order system y0' = y1, ..., y(n-2)' = y(n-1), y(n-1)' = g
+    vectorized -> compile a single equation with NumPy as well, so that
+              f(x, y) accepts arrays of x and y (ensemble integration)
+    backend -> "numpy", or "numexpr" / "numba" when installed
+
+    f is generated with common subexpressions eliminated and cached in
+    memory and on disk (compiled.py), so a repeated run skips SymPy.
+
+    Returns:
+    f  -> scalar function (math module) for one first-order equation,
+          otherwise a function returning the derivative as a NumPy array
+    m  -> number of state components
+
+    Raises ExpressionError (a ValueError) for invalid input.
+    """
+    return compile_ode(text, order, vectorized, backend)
+
+
+# Number of fixed steps h from x0 to xf; the last one is shortened to end
+# exactly at xf (rounding keeps float noise from adding a tiny extra step)
+def step_count(x0, xf, h):
+    return max(0, math.ceil(round((xf - x0) / h, 9)))
+
+
+def sample_grid(x0, h, n_steps, every=1, final_only=False, xf=None):
+    """
+    Steps kept out of n_steps fixed steps and their x values x0 + i*h.
+
+    Parameters:
+    every       -> keep every k-th step (the last step is always kept)
+    final_only  -> keep only the last step
+    xf          -> exact x of the last step (when it is shortened)
+
+    Returns:
+    keep    -> range of the kept steps before the last one (step i is
+               stored in slot i // every, the last step in slot -1)
+    x_vals  -> NumPy array of the x values of all kept steps
+    """
+    keep = range(0) if final_only else range(0, n_steps, every)
+    x_vals = x0 + np.append(np.arange(len(keep)) * every, n_steps) * float(h)
+    if xf is not None and n_steps > 0:
+        x_vals[-1] = xf
+    return keep, x_vals
+
+
+# Preallocated array for the kept states: (samples,) or (samples, m)
+def state_array(keep, y):
+    return np.empty((len(keep) + 1,) + np.shape(y))
+
+
+def fixed_step(step, y0, x0, h, n_steps, every=1, final_only=False, xf=None):
+    """
+    Driver of the fixed-step methods: runs y_(i+1) = step(x_i, y_i, h) on
+    the grid x_i = x0 + i*h and keeps the states in preallocated arrays.
+
+    Parameters:
+    step        -> one step of the method, step(x, y, h) -> next y
+    every       -> keep every k-th step (the last step is always kept)
+    final_only  -> keep only the last step
+    xf          -> end of the interval; the last step is shortened to end
+                   exactly there (without xf every step has length h)
+
+    Returns:
+    x_vals, y_vals -> NumPy arrays of the kept steps
+    """
+    y = as_state(y0)
+    keep, x_vals = sample_grid(x0, h, n_steps, every, final_only, xf)
+    y_vals = state_array(keep, y)
+    for i in range(n_steps):
+        if i in keep:                   # O(1) membership test on a range
+            y_vals[i // every] = y
+        x = x0 + i * h
+        y = step(x, y, xf - x if xf is not None and i == n_steps - 1 else h)
+    y_vals[-1] = y
+    return x_vals, y_vals
+
+
+# Read initial value(s): one number gives a scalar, several a state vector
+def read_state(prompt):
+    values = [float(v) for v in input(prompt).replace(",", " ").split()]
+    if not values:
+        raise ValueError("No initial value given.")
+    return values[0] if len(values) == 1 else np.array(values)
+
+
+# Format a scalar or a state vector with the given number of decimals
+def format_state(y, decimals=5):
+    if np.ndim(y) == 0:
+        return f"{y:.{decimals}f}"
+    return np.array2string(np.asarray(y), precision=decimals, floatmode="fixed")
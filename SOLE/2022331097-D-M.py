@@ -1,57 +1,66 @@
+import sys
+
 import numpy as np
+from determinant import slogdet_from_lu
+from loaders import load_matrix
+from lu import lu_factor, lu_unpack
 
-# Function for LU Decomposition (without pivoting)
-def LU_Decomposition(A):
-    A = A.astype(float)   # Ensure matrix uses floating point numbers
-    n = A.shape[0]        # Number of rows (size of matrix)
-    L = np.zeros((n, n))  # Initialize L (lower triangular matrix) with zeros
-    U = A.copy()          # Copy of A that will be transformed into U
+# Function for LU Decomposition (PA = LU, blocked with partial pivoting)
+# overwrite_a=True factors in A's own buffer (float64 arrays; A is destroyed)
+# packed=True returns (LU, perm) with L and U kept in that one array; with partial
+# pivoting these always exist, so a singular A is returned too (det = 0)
+def LU_Decomposition(A, overwrite_a=False, packed=False):
+    LU, perm = lu_factor(A, overwrite_a=overwrite_a)  # L and U packed in one n x n array
 
-    # Set diagonal of L to 1 (as per LU decomposition convention)
-    for i in range(n):
-        L[i, i] = 1.0
+    if packed:
+        return LU, perm             # No separate n x n L and U
 
-    # Forward elimination process to build L and U
-    for i in range(n - 1):
-        if U[i, i] == 0:   # Check for zero pivot (no pivoting implemented here)
-            print("Can't apply forward elimination: zero pivot.")
-            return None, None
-        for j in range(i + 1, n):
-            # Compute elimination factor
-            factor = U[j, i] / U[i, i]
-            L[j, i] = factor  # Store factor in L
-            # Subtract factor * pivot row from current row to eliminate entry
-            U[j, i:] -= factor * U[i, i:]
+    # A zero pivot before the last row means no usable decomposition
+    if np.any(np.diagonal(LU)[:-1] == 0):
+        print("Can't apply forward elimination: zero pivot.")
+        return None, None, None
 
-    return L, U
+    L, U = lu_unpack(LU)
+    return L, U, perm
 
 
-# Function to compute determinant from U
-def determinant(U):
-    det = 1
-    # Determinant = product of diagonal elements of U
-    for i in range(len(U)):
-        det *= U[i][i]
-    return det
+# Function to compute determinant from U (or the packed LU) and the row permutation
+def determinant(U, perm):
+    # sign(P) * prod(diag(U)) taken as a sum of logs, so it cannot overflow midway
+    sign, logdet = slogdet_from_lu(U, perm)
+    return sign * np.exp(logdet)
 
 
 # Main program
-n = int(input("Enter the size of the matrix (n): "))
+# Usage: python 2022331097-D-M.py [A]  (path to .npy/.npz/.mtx/CSV/text, "-" = stdin)
+if len(sys.argv) > 1:
+    A = load_matrix(sys.argv[1])        # Bulk load, no prompts
+else:
+    n = int(input("Enter the size of the matrix (n): "))
+
+    print("Enter the coefficient matrix row by row (space separated):")
+    A = []
+    for i in range(n):
+        # Read each row of the matrix from user
+        row = list(map(float, input(f"Row {i+1}: ").split()))
+        A.append(row)
+
+    # Convert input list to numpy array
+    A = np.array(A)
 
-print("Enter the coefficient matrix row by row (space separated):")
-A = []
-for i in range(n):
-    # Read each row of the matrix from user
-    row = list(map(float, input(f"Row {i+1}: ").split()))
-    A.append(row)
+# Perform LU Decomposition (the packed factors exist even for a singular A)
+LU, perm = LU_Decomposition(A, packed=True)
 
-# Convert input list to numpy array
-A = np.array(A)
+# A zero pivot before the last row: det = 0, but no usable L and U to print
+if np.any(np.diagonal(LU)[:-1] == 0):
+    print("Can't apply forward elimination: zero pivot.")
+else:
+    L, U = lu_unpack(LU)
 
-# Perform LU Decomposition
-L, U = LU_Decomposition(A)
+    # Print P
+    print("\nRow permutation (P):")
+    print(" ".join(str(i + 1) for i in perm))
 
-if L is not None and U is not None:
     # Print L
     print("\nLower triangular matrix (L):")
     for row in L:
@@ -62,6 +71,10 @@ if L is not None and U is not None:
     for row in U:
         print(" ".join(f"{val:.6f}" for val in row))
 
-    # Compute determinant
-    det = determinant(U)
-    print(f"\nDeterminant of the matrix: {det:.6f}")
+# Compute determinant (sign 0 and log|det| = -inf for a singular A)
+det = determinant(LU, perm)
+print(f"\nDeterminant of the matrix: {det:.6f}")
+
+# log|det| stays finite even when det itself over/underflows
+sign, logdet = slogdet_from_lu(LU, perm)
+print(f"Sign and log|det|: {sign:+.0f}, {logdet:.6f}")
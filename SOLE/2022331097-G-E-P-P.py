@@ -1,79 +1,87 @@
-import numpy as np
+import sys
 
-# Function to calculate dot product between two vectors
-def sum_clc(a, b):
-    total = 0
-    for i in range(len(a)):
-        total += a[i] * b[i]
-    return total
+import numpy as np
+from condition import SolveResult
+from loaders import load_system
+from refinement import MixedPrecisionLU
+from structure import factorize
 
 # Gaussian Elimination with Partial Pivoting
-def Partial_Pivoting(A, b):
-    A = A.astype(float)            # Convert matrix A to float type
-    b = b.astype(float).flatten()  # Convert RHS vector b to 1D float array
-    n = len(b)                     # Number of equations (size of system)
+# b may be a vector, an (n, k) block of right-hand sides or an iterator of vectors
+# mixed_precision=True factors a dense A in float32 and refines the result to float64
+# accuracy; A is kept for the float64 residuals, so overwrite_a is ignored, and
+# sparse / tridiagonal / band input is factored by factorize() in float64 as usual
+# diagnostics=True returns a SolveResult with pivot growth and condition estimate
+# (plus the refinement steps and float64 fallback of a mixed-precision solve)
+# overwrite_a / overwrite_b=True factor in A's buffer and solve in b's buffer
+# (float arrays only; both are destroyed), so a solve needs no extra copy of A
+# A may also be a (lower, diag, upper) tuple, or band storage with kl / ku given
+def Partial_Pivoting(A, b, mixed_precision=False, diagnostics=False,
+                     overwrite_a=False, overwrite_b=False, kl=None, ku=None):
+    # Forward Elimination with Partial Pivoting (banded A uses compact band storage,
+    # scipy sparse A the RCM-ordered sparse elimination)
+    dense = not (hasattr(A, "tocsr") or isinstance(A, tuple) or kl is not None or ku is not None)
+    mixed_precision = mixed_precision and dense
+    if mixed_precision:
+        factorization = MixedPrecisionLU(A)
+    else:
+        factorization = factorize(A, pivot=True, overwrite_a=overwrite_a, kl=kl, ku=ku)
 
-    # Forward Elimination with Partial Pivoting
-    for i in range(n-1):
-        # Step 1: Find row with maximum absolute value in column i (pivot row)
-        max_row = np.argmax(abs(A[i:, i])) + i
-        
-        # If pivot element is zero even after row swapping -> no unique solution
-        if A[max_row, i] == 0:
-            print("Zero pivot element detected. Cannot solve.")
-            return
-        
-        # Step 2: Swap rows in A and corresponding b values
-        A[[i, max_row]] = A[[max_row, i]]
-        b[i], b[max_row] = b[max_row], b[i]
-        
-        # Step 3: Eliminate entries below the pivot
-        for j in range(i+1, n):
-            factor = A[j, i] / A[i, i]
-            A[j, i:] -= factor * A[i, i:]   # Update row j of A
-            b[j] -= factor * b[i]           # Update RHS vector
-
-    # If the last pivot is zero, system cannot be solved
-    if A[-1, -1] == 0:
+    # If a pivot element is zero even after row swapping -> no unique solution
+    if factorization.singular:
         print("Zero pivot element detected. Cannot solve.")
         return
 
-    # Back Substitution
-    x = np.zeros(n)                # Initialize solution vector
-    x[-1] = b[-1] / A[-1, -1]      # Solve last variable directly
-    for i in range(n-2, -1, -1):   # Loop from second-last row up to first
-        if A[i, i] == 0:
-            print("Zero pivot element detected during back substitution. Cannot solve.")
-            return
-        result = sum_clc(A[i, i+1:], x[i+1:])  # Compute sum of known terms
-        x[i] = (b[i] - result) / A[i, i]       # Solve for current variable
+    if isinstance(b, np.ndarray) and b.ndim == 2 and b.shape[1] == 1:
+        b = b.reshape(-1)            # single column -> 1D vector (view, no copy)
 
+    # Forward + Back Substitution with the stored factors
+    x = factorization.solve(b, overwrite_b=overwrite_b)
+    if diagnostics:
+        if not mixed_precision:
+            return SolveResult(x, factorization.growth, factorization.condition_estimate())
+        steps, fell_back = factorization.steps, factorization.fell_back   # of this solve
+        return SolveResult(x, factorization.growth, factorization.condition_estimate(),
+                           steps, fell_back)
     return x
 
 
 # ---------------- Main Program ----------------
 
-n = int(input("Enter the size of the matrix (n): "))
+# Usage: python 2022331097-G-E-P-P.py [A b | Ab]  (paths to .npy/.npz/.mtx/CSV/text, "-" = stdin)
+if len(sys.argv) > 1:
+    A, b = load_system(sys.argv[1:], sparse=True)   # Bulk load, no prompts (.mtx stays sparse)
+else:
+    n = int(input("Enter the size of the matrix (n): "))
 
-print("Enter the coefficient matrix row by row (space separated):")
-A = []
-for i in range(n):
-    row = list(map(float, input(f"Row {i+1}: ").split()))
-    A.append(row)
+    print("Enter the coefficient matrix row by row (space separated):")
+    A = []
+    for i in range(n):
+        row = list(map(float, input(f"Row {i+1}: ").split()))
+        A.append(row)
 
-print("Enter the RHS vector row by row (one value per line):")
-b = []
-for i in range(n):
-    val = float(input(f"b[{i+1}]: "))
-    b.append([val])
+    print("Enter the RHS vector row by row (one value per line):")
+    b = []
+    for i in range(n):
+        val = float(input(f"b[{i+1}]: "))
+        b.append([val])
 
-A = np.array(A)
-b = np.array(b)
+    A = np.array(A)
+    b = np.array(b)
 
-solution = Partial_Pivoting(A, b)
+result = Partial_Pivoting(A, b, diagnostics=True)
 
 # Print solution if found
-if solution is not None:
+if result is not None:
     print("\nSolution vector (x):")
-    for i, val in enumerate(solution, start=1):
+    for i, val in enumerate(result.x, start=1):
         print(f"x{i} = {val}")
+
+    # Reliability of the result
+    print(f"\nPivot growth: {result.pivot_growth:.3g}")
+    print(f"Estimated condition number (1-norm): {result.condition:.3g}")
+    if result.refinement_steps is not None:
+        fallback = " (fell back to float64)" if result.fell_back else ""
+        print(f"Mixed precision: {result.refinement_steps} refinement steps{fallback}")
+    if result.ill_conditioned:
+        print("Warning: matrix is ill-conditioned, the result may be inaccurate.")
@@ -1,89 +1,71 @@
-import numpy as np
-
-# Function to perform LU Decomposition
-def LU_Decomposition(A):
-    A = A.astype(float)         # Convert matrix A to float for division operations
-    n = A.shape[0]              # Number of rows (and columns, since A is square)
-    L = np.zeros((n, n))        # Initialize Lower triangular matrix L with zeros
-    U = A.copy()                # Copy of A, will be transformed into Upper triangular matrix U
-
-    # Set diagonal of L to 1 (Doolittle’s method)
-    for i in range(n):
-        L[i, i] = 1.0
-
-    # Forward elimination process
-    for i in range(n - 1):
-        if U[i, i] == 0:        # If pivot is zero, LU decomposition fails
-            print("Can't apply forward elimination: zero pivot.")
-            return None, None
-        for j in range(i + 1, n):
-            factor = U[j, i] / U[i, i]   # Multiplier for elimination
-            L[j, i] = factor             # Store factor in L
-            U[j, i:] -= factor * U[i, i:]  # Eliminate below-diagonal elements in U
-
-    return L, U
-
-
-# Helper function for dot product (like np.dot but written manually)
-def sum_clc(a, b):
-    total = 0
-    for i in range(len(a)):
-        total += a[i] * b[i]
-    return total
+import sys
 
+import numpy as np
+from condition import SolveResult
+from inverse import InverseOperator
+from loaders import load_matrix
+from structure import factorize
 
 # Function to calculate the Inverse of a matrix using LU decomposition
-def InverseMatrix(A):
-    A = A.astype(float)
+# columns / rows -> optional indices (list, array or slice) to return only
+#                   selected columns or a block of the inverse
+# diagnostics    -> return a SolveResult with pivot growth and condition estimate
+# lazy           -> return an InverseOperator (A^-1 v, columns, diagonal on
+#                   demand) instead of building the dense inverse
+def InverseMatrix(A, columns=None, rows=None, diagnostics=False, lazy=False):
     n = A.shape[0]
-    I = np.eye(n)                      # Identity matrix of size n
-    inverse_matrix = np.zeros((n, n))  # To store the final inverse
 
-    # Step 1: Perform LU decomposition
-    L, U = LU_Decomposition(A)
-    if L is None or U is None:
+    # Step 1: Perform LU decomposition (PA = LU); symmetric A uses Cholesky / LDL^T
+    factorization = factorize(A)
+    if factorization.singular:
+        print("Can't apply forward elimination: zero pivot.")
         return None
-
-    # Step 2: Solve n systems (Ax = e_i, where e_i is ith column of Identity)
-    for i in range(n):
-        b = I[:, i].copy()   # ith column of Identity (unit vector)
-
-        # Forward substitution to solve Lz = b
-        z = np.zeros(n)
-        z[0] = b[0] / L[0, 0]
-        for j in range(1, n):
-            result = sum_clc(L[j, :j], z[:j])
-            z[j] = (b[j] - result) / L[j, j]
-
-        # Backward substitution to solve Ux = z
-        x = np.zeros(n)
-        x[-1] = z[-1] / U[-1, -1]
-        for j in range(n - 2, -1, -1):
-            result = sum_clc(U[j, j+1:], x[j+1:])
-            x[j] = (z[j] - result) / U[j, j]
-
-        # Store the solution vector as ith column of the inverse
-        inverse_matrix[:, i] = x
-
+    if lazy:
+        return InverseOperator(factorization=factorization)
+
+    # Step 2: Right-hand sides are the requested columns of the Identity
+    if columns is None:
+        columns = np.arange(n)
+    columns = np.arange(n)[columns]    # Normalise slices / lists to an index array
+    E = np.zeros((n, len(columns)))
+    E[columns, np.arange(len(columns))] = 1.0
+
+    # Step 3: Solve all systems at once, every substitution step updates a whole row
+    inverse_matrix = factorization.solve(E)
+
+    if rows is not None:
+        inverse_matrix = inverse_matrix[rows]
+    if diagnostics:
+        return SolveResult(inverse_matrix, factorization.growth, factorization.condition_estimate())
     return inverse_matrix
 
 
 # ----------- MAIN PROGRAM -----------
-n = int(input("Enter the size of the matrix (n): "))
-
-print("Enter the coefficient matrix row by row (space separated):")
-A = []
-for i in range(n):
-    row = list(map(float, input(f"Row {i+1}: ").split()))
-    A.append(row)
+# Usage: python 2022331097-I-M.py [A]  (path to .npy/.npz/.mtx/CSV/text, "-" = stdin)
+if len(sys.argv) > 1:
+    A = load_matrix(sys.argv[1])        # Bulk load, no prompts
+else:
+    n = int(input("Enter the size of the matrix (n): "))
+
+    print("Enter the coefficient matrix row by row (space separated):")
+    A = []
+    for i in range(n):
+        row = list(map(float, input(f"Row {i+1}: ").split()))
+        A.append(row)
 
-A = np.array(A)
+    A = np.array(A)
 
 # Compute inverse
-inverse_A = InverseMatrix(A)
+result = InverseMatrix(A, diagnostics=True)
 
 # Display result
-if inverse_A is not None:
+if result is not None:
     print("\nInverse Matrix:")
-    for row in inverse_A:
+    for row in result.x:
         print(" ".join(f"{val:.6f}" for val in row))
+
+    # Reliability of the result
+    print(f"\nPivot growth: {result.pivot_growth:.3g}")
+    print(f"Estimated condition number (1-norm): {result.condition:.3g}")
+    if result.ill_conditioned:
+        print("Warning: matrix is ill-conditioned, the result may be inaccurate.")
@@ -1,48 +1,54 @@
+import sys
+
 import numpy as np
+from loaders import load_matrix
+from lu import lu_factor, lu_unpack
 
-# Function to perform LU Decomposition of matrix A
-def LU_Decomposition(A):
-    A = A.astype(float)         # Convert entries to float (for safe division)
-    n = A.shape[0]              # Number of rows (and columns since A is square)
-    L = np.zeros((n, n))        # Initialize L (lower triangular) as zero matrix
-    U = A.copy()                # Copy A to U (will be transformed to upper triangular)
+# Function to perform LU Decomposition of matrix A (PA = LU)
+# overwrite_a=True factors in A's own buffer (float64 arrays; A is destroyed)
+# packed=True returns (LU, perm) with L and U kept in that one array
+def LU_Decomposition(A, overwrite_a=False, packed=False):
+    # Blocked factorization with partial pivoting, L and U packed in one array
+    LU, perm = lu_factor(A, overwrite_a=overwrite_a)
 
-    # Step 1: Set diagonal elements of L to 1
-    for i in range(n):
-        L[i, i] = 1.0
+    # A zero pivot before the last row means no usable decomposition
+    if np.any(np.diagonal(LU)[:-1] == 0):
+        print("Can't apply forward elimination: zero pivot.")
+        return (None, None) if packed else (None, None, None)
 
-    # Step 2: Perform Gaussian elimination to transform A into U
-    for i in range(n - 1):
-        if U[i, i] == 0:        # If pivot is zero, cannot proceed
-            print("Can't apply forward elimination: zero pivot.")
-            return None, None
-        for j in range(i + 1, n):               # Eliminate entries below pivot
-            factor = U[j, i] / U[i, i]          # Compute multiplier
-            L[j, i] = factor                    # Store multiplier in L
-            U[j, i:] -= factor * U[i, i:]       # Update row j in U (row operation)
+    if packed:
+        return LU, perm             # No separate n x n L and U
 
-    return L, U
+    L, U = lu_unpack(LU)    # Split packed storage into L (unit diagonal) and U
+    return L, U, perm
 
 
 # ----------- MAIN PROGRAM -----------
 
-# Input matrix size
-n = int(input("Enter the size of the matrix (n): "))
+# Usage: python 2022331097-L-U-D.py [A]  (path to .npy/.npz/.mtx/CSV/text, "-" = stdin)
+if len(sys.argv) > 1:
+    A = load_matrix(sys.argv[1])        # Bulk load, no prompts
+else:
+    # Input matrix size
+    n = int(input("Enter the size of the matrix (n): "))
 
-print("Enter the coefficient matrix row by row (space separated):")
-A = []
-for i in range(n):
-    # Read each row as float values
-    row = list(map(float, input(f"Row {i+1}: ").split()))
-    A.append(row)
+    print("Enter the coefficient matrix row by row (space separated):")
+    A = []
+    for i in range(n):
+        # Read each row as float values
+        row = list(map(float, input(f"Row {i+1}: ").split()))
+        A.append(row)
 
-A = np.array(A)    # Convert list of lists into numpy array
+    A = np.array(A)    # Convert list of lists into numpy array
 
 # Perform LU decomposition
-L, U = LU_Decomposition(A)
+L, U, perm = LU_Decomposition(A)
 
 # Print results if decomposition was successful
 if L is not None and U is not None:
+    print("\nRow permutation (P):")
+    print(" ".join(str(i + 1) for i in perm))
+
     print("\nLower triangular matrix (L):")
     for row in L:
         print(" ".join(f"{val:.6f}" for val in row))
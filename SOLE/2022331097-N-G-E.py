@@ -1,61 +1,67 @@
-import numpy as np
-
-# Function to calculate dot product of two vectors (used in back substitution)
-def sum_clc(a, b):
-    total = 0
-    for i in range(len(a)):
-        total += a[i] * b[i]   # multiply corresponding elements and add
-    return total
+import sys
 
+import numpy as np
+from condition import SolveResult
+from loaders import load_system
+from structure import factorize
 
 # Function to solve system of linear equations Ax = b using Gaussian Elimination
-def GaussElimination(A, b):
-    A = A.astype(float)              # convert matrix A to float type
-    b = b.astype(float).flatten()    # convert b to 1D float array
-    n = len(b)                       # number of equations / unknowns
-
-    # ---- Forward Elimination ----
-    for i in range(n-1):             # loop over pivot rows
-        if A[i, i] == 0:             # check pivot element
-            print("Can't apply Gaussian elimination: zero pivot")
-            return
-        for j in range(i+1, n):      # eliminate values below the pivot
-            factor = A[j, i] / A[i, i]        # multiplier for row operation
-            A[j, i:] = A[j, i:] - factor * A[i, i:]   # update row j of A
-            b[j] = b[j] - factor * b[i]               # update RHS vector b
-
-    # ---- Back Substitution ----
-    x = np.zeros(n)                  # initialize solution vector x
-    x[n-1] = b[n-1] / A[n-1, n-1]    # solve last variable directly
-    for i in range(n-2, -1, -1):     # move upward through rows
-        result = sum_clc(A[i, i+1:], x[i+1:])         # compute sum(A[i][k]*x[k])
-        x[i] = (b[i] - result) / A[i, i]              # solve for x[i]
+# b may be a vector, an (n, k) block of right-hand sides or an iterator of vectors
+# diagnostics=True returns a SolveResult with pivot growth and condition estimate
+# overwrite_a / overwrite_b=True factor in A's buffer and solve in b's buffer
+# (float arrays only; both are destroyed), so a solve needs no extra copy of A
+# A may also be a (lower, diag, upper) tuple, or band storage with kl / ku given
+def GaussElimination(A, b, diagnostics=False, overwrite_a=False, overwrite_b=False,
+                     kl=None, ku=None):
+    # ---- Forward Elimination (done once; banded / tridiagonal A use the compact path) ----
+    factorization = factorize(A, pivot=False, overwrite_a=overwrite_a, kl=kl, ku=ku)
+    if factorization.singular:       # check pivot elements
+        print("Can't apply Gaussian elimination: zero pivot")
+        return
 
+    if isinstance(b, np.ndarray) and b.ndim == 2 and b.shape[1] == 1:
+        b = b.reshape(-1)            # single column -> 1D vector (view, no copy)
+
+    # ---- Forward/Back Substitution with the stored factors ----
+    x = factorization.solve(b, overwrite_b=overwrite_b)
+    if diagnostics:
+        return SolveResult(x, factorization.growth, factorization.condition_estimate())
     return x
 
 
 # ---- Main Program ----
-n = int(input("Enter the size of the matrix (n): "))
+# Usage: python 2022331097-N-G-E.py [A b | Ab]  (paths to .npy/.npz/.mtx/CSV/text, "-" = stdin)
+if len(sys.argv) > 1:
+    A, b = load_system(sys.argv[1:])   # Bulk load, no prompts
+else:
+    n = int(input("Enter the size of the matrix (n): "))
 
-print("Enter the coefficient matrix row by row (space separated):")
-A = []
-for i in range(n):
-    row = list(map(float, input(f"Row {i+1}: ").split()))  # read row of A
-    A.append(row)
+    print("Enter the coefficient matrix row by row (space separated):")
+    A = []
+    for i in range(n):
+        row = list(map(float, input(f"Row {i+1}: ").split()))  # read row of A
+        A.append(row)
 
-print("Enter the RHS vector row by row (one value per line):")
-b = []
-for i in range(n):
-    val = float(input(f"b[{i+1}]: "))   # read each value of RHS vector b
-    b.append([val])
+    print("Enter the RHS vector row by row (one value per line):")
+    b = []
+    for i in range(n):
+        val = float(input(f"b[{i+1}]: "))   # read each value of RHS vector b
+        b.append([val])
 
-A = np.array(A)   # convert list into numpy array
-b = np.array(b)
+    A = np.array(A)   # convert list into numpy array
+    b = np.array(b)
 
 # Solve system
-solution = GaussElimination(A, b)
+result = GaussElimination(A, b, diagnostics=True)
 
 # Print solution
-print("\nSolution vector (x):")
-for i, val in enumerate(solution, start=1):
-    print(f"x{i} = {val}")
+if result is not None:
+    print("\nSolution vector (x):")
+    for i, val in enumerate(result.x, start=1):
+        print(f"x{i} = {val}")
+
+    # Reliability of the result
+    print(f"\nPivot growth: {result.pivot_growth:.3g}")
+    print(f"Estimated condition number (1-norm): {result.condition:.3g}")
+    if result.ill_conditioned:
+        print("Warning: matrix is ill-conditioned, the result may be inaccurate.")
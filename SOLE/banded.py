@@ -0,0 +1,264 @@
+import numpy as np
+from factorization import Factorization
+
+try:                                    # Optional: LAPACK banded LU (compiled kernels)
+    from scipy.linalg.lapack import dgbtrf, dgbtrs
+except ImportError:
+    dgbtrf = dgbtrs = None
+
+
+# Pull the three diagonals out of a dense tridiagonal matrix
+def tridiagonal_diagonals(A):
+    lower = np.concatenate(([0.0], np.diagonal(A, -1)))   # a[0] unused
+    diag = np.array(np.diagonal(A), dtype=float)
+    upper = np.concatenate((np.diagonal(A, 1), [0.0]))    # c[-1] unused
+    return lower, diag, upper
+
+
+# Compact (LAPACK-style) band storage: ab[kl + ku + i - j, j] = A[i, j]
+# The top kl rows stay zero and receive the fill-in of partial pivoting.
+def to_banded(A, kl, ku):
+    n = A.shape[0]
+    ab = np.zeros((2 * kl + ku + 1, n))
+    for offset in range(max(-kl, 1 - n), min(ku, n - 1) + 1):   # offset = j - i; |offset| < n
+        d = np.diagonal(A, offset)
+        if offset >= 0:
+            ab[kl + ku - offset, offset:] = d
+        else:
+            ab[kl + ku - offset, :n + offset] = d
+    return ab
+
+
+# Band storage of a tridiagonal matrix given by its diagonals (kl = ku = 1)
+def tridiagonal_to_banded(lower, diag, upper):
+    n = len(diag)
+    ab = np.zeros((4, n))
+    ab[1, 1:] = upper[:n - 1]
+    ab[2] = diag
+    ab[3, :n - 1] = lower[1:n]
+    return ab
+
+
+# Band storage as given by the caller: the 2*kl + ku + 1 rows of to_banded, or
+# the compact kl + ku + 1 rows without the fill-in rows (zero rows added on top)
+def as_banded(ab, kl, ku):
+    ab = np.asarray(ab, dtype=float)
+    if ab.shape[0] == kl + ku + 1:
+        ab = np.vstack((np.zeros((kl, ab.shape[1])), ab))
+    if ab.shape[0] != 2 * kl + ku + 1:
+        raise ValueError(f"Band storage needs {kl + ku + 1} or {2 * kl + ku + 1} rows, got {ab.shape[0]}.")
+    return ab
+
+
+class TridiagonalFactorization(Factorization):
+    """
+    Tridiagonal solver without pivoting (same conditions as the Thomas
+    algorithm, e.g. diagonal dominance). The Thomas recurrence is run as
+    cyclic reduction so every level is one array operation: the factor
+    step stores the elimination weights of all log2(n) levels and each
+    solve is O(n) vectorized work.
+
+    Parameters:
+    lower  -> sub-diagonal a (a[0] ignored), length n
+    diag   -> main diagonal b, length n
+    upper  -> super-diagonal c (c[-1] ignored), length n
+    """
+
+    def __init__(self, lower, diag, upper):
+        self.n = len(diag)
+        self.diagonals = (np.array(lower, dtype=float), np.array(diag, dtype=float),
+                          np.array(upper, dtype=float))
+        self.transposed = None
+        # Pad to N = 2^m - 1 equations with identity rows
+        N = 1
+        while N < self.n:
+            N = 2 * N + 1
+        self.N = N
+        a, b, c = np.zeros(N), np.ones(N), np.zeros(N)
+        a[1:self.n] = lower[1:self.n]
+        b[:self.n] = diag
+        c[:self.n - 1] = upper[:self.n - 1]
+
+        # Forward reduction: equation i absorbs its neighbours i - s and i + s
+        self.levels = []
+        s = 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            while 4 * s <= N + 1:             # Stop once only the centre is left
+                idx = np.arange(2 * s - 1, N, 2 * s)
+                alpha = -a[idx] / b[idx - s]
+                gamma = -c[idx] / b[idx + s]
+                b[idx] += alpha * c[idx - s] + gamma * a[idx + s]
+                a[idx] = alpha * a[idx - s]
+                c[idx] = gamma * c[idx + s]
+                self.levels.append((s, idx, alpha, gamma))
+                s *= 2
+        self.a, self.b, self.c = a, b, c
+        # Every divisor used by reduction and back substitution is a final b[i]
+        self.singular = bool(np.any(b == 0) or not np.all(np.isfinite(b)))
+
+        # ||A||_1 (column sums) and growth of the reduced coefficients
+        lower, diag, upper = self.diagonals
+        column = np.abs(diag)
+        column[:-1] += np.abs(lower[1:self.n])
+        column[1:] += np.abs(upper[:self.n - 1])
+        self.norm1 = float(column.max()) if self.n else 0.0
+        a_max = max(np.max(np.abs(v[:self.n])) for v in self.diagonals) if self.n else 0.0
+        with np.errstate(invalid="ignore"):     # Identity padding rows are not part of A
+            reduced_max = max(np.max(np.abs(v[:self.n])) for v in (a, b, c)) if self.n else 0.0
+        self.growth = float(reduced_max / a_max) if a_max > 0 else 1.0
+
+    def _solve_array(self, rhs):
+        rhs = self._check_rhs(rhs)
+        extra = (1,) * (rhs.ndim - 1)          # Broadcast weights over RHS columns
+        d = np.zeros((self.N,) + rhs.shape[1:])
+        d[:self.n] = rhs
+
+        for s, idx, alpha, gamma in self.levels:
+            d[idx] += alpha.reshape(-1, *extra) * d[idx - s] + gamma.reshape(-1, *extra) * d[idx + s]
+
+        # Back substitution level by level; xp[i + 1] = x[i], zero outside 0..N-1
+        xp = np.zeros((self.N + 2,) + rhs.shape[1:])
+        a, b, c = (v.reshape(-1, *extra) for v in (self.a, self.b, self.c))
+        s = (self.N + 1) // 2
+        while s >= 1:
+            i = np.arange(s - 1, self.N, 2 * s)
+            xp[i + 1] = (d[i] - a[i] * xp[i - s + 1] - c[i] * xp[i + s + 1]) / b[i]
+            s //= 2
+        return xp[1:self.n + 1]
+
+    # A^T is tridiagonal as well: its sub- and super-diagonals are swapped
+    def _solve_transpose_array(self, rhs):
+        if self.transposed is None:
+            lower, diag, upper = self.diagonals
+            lower_t = np.concatenate(([0.0], upper[:self.n - 1]))
+            upper_t = np.concatenate((lower[1:self.n], [0.0]))
+            self.transposed = TridiagonalFactorization(lower_t, diag, upper_t)
+        return self.transposed._solve_array(rhs)
+
+
+# Solve one tridiagonal system a_i x_{i-1} + b_i x_i + c_i x_{i+1} = d_i
+def tridiagonal_solve(lower, diag, upper, d):
+    return TridiagonalFactorization(lower, diag, upper).solve(d)
+
+
+class BandedLUFactorization(Factorization):
+    """
+    LU factorization of a banded matrix in compact storage, O(n * kl * (kl + ku))
+    to factor and O(n * (kl + ku)) per solve. With partial pivoting and scipy
+    installed the factor and solves run in LAPACK (dgbtrf / dgbtrs); the
+    row-by-row NumPy loops are used without pivoting or without scipy.
+
+    Parameters:
+    ab     -> band storage from to_banded (2*kl + ku + 1 rows, n columns)
+    kl     -> number of sub-diagonals
+    ku     -> number of super-diagonals
+    pivot  -> use partial pivoting (upper bandwidth grows to kl + ku)
+    """
+
+    def __init__(self, ab, kl, ku, pivot=True):
+        ab = np.array(ab, dtype=float)
+        n = ab.shape[1]
+        self.n, self.kl, self.ku = n, kl, ku
+        # Column j of ab holds the band of column j of A
+        self.norm1 = float(np.max(np.sum(np.abs(ab), axis=0))) if n else 0.0
+        a_max = np.max(np.abs(ab)) if n else 0.0
+        self.lapack = pivot and dgbtrf is not None and n > 0
+        if self.lapack:
+            self.lu, self.ipiv, info = dgbtrf(ab, kl, ku, overwrite_ab=True)
+            self.singular = info > 0                # U[info - 1, info - 1] == 0
+            u_max = np.max(np.abs(self.lu[:kl + ku + 1]))
+            self.growth = float(u_max / a_max) if a_max > 0 else 1.0
+            return
+        w = kl + ku                          # Upper bandwidth of U with fill-in
+        diag_row = kl + ku                   # Row of ab holding A[j, j]
+        self.piv = np.arange(n)
+        # Row offsets in ab for the update block A[k+1+di, k+1+dj]
+        di = np.arange(kl)[:, None]
+        dj = np.arange(w)[None, :]
+        block_rows = diag_row + di - dj
+
+        for k in range(n):
+            m = min(kl, n - 1 - k)           # Rows below the pivot inside the band
+            cols = min(w, n - 1 - k)         # Columns right of the pivot inside the band
+
+            if pivot and m > 0:
+                p = np.argmax(np.abs(ab[diag_row:diag_row + m + 1, k]))
+                if p != 0:
+                    # Swap rows k and k + p for the columns k .. k + cols
+                    j = np.arange(k, k + cols + 1)
+                    r = diag_row + k - j
+                    ab[r, j], ab[r + p, j] = ab[r + p, j], ab[r, j].copy()
+                    self.piv[k] = k + p
+
+            if ab[diag_row, k] == 0 or m == 0:
+                continue
+            ab[diag_row + 1:diag_row + m + 1, k] /= ab[diag_row, k]   # Multipliers
+
+            # Rank-1 update of the band block below and right of the pivot
+            l = ab[diag_row + 1:diag_row + m + 1, k]
+            u = ab[diag_row - 1 - np.arange(cols), k + 1 + np.arange(cols)]
+            ab[block_rows[:m, :cols], k + 1 + dj[0, :cols]] -= np.outer(l, u)
+
+        # U row by row: U_rows[i, t] = U[i, i + t] (zero past the last column)
+        t = np.arange(w + 1)
+        i = np.arange(n)[:, None]
+        j = i + t
+        inside = j < n
+        self.U_rows = np.zeros((n, w + 1))
+        self.U_rows[inside] = ab[(diag_row - t + np.zeros_like(i))[inside], j[inside]]
+        # L multipliers column by column: L_cols[k, t] = L[k + 1 + t, k]
+        self.L_cols = ab[diag_row + 1:, :].T.copy()
+        self.singular = bool(np.any(self.U_rows[:, 0] == 0))
+        self.growth = float(np.max(np.abs(self.U_rows)) / a_max) if a_max > 0 else 1.0
+
+    # A x = b (trans=0) or A^T x = b (trans=1) with the LAPACK factors
+    def _solve_lapack(self, b, trans):
+        b = self._check_rhs(b)
+        x, _ = dgbtrs(self.lu, self.kl, self.ku, b.reshape(self.n, -1), self.ipiv, trans=trans)
+        return x.reshape(b.shape)
+
+    def _solve_array(self, b):
+        if self.lapack:
+            return self._solve_lapack(b, 0)
+        x = np.array(self._check_rhs(b))
+        n, kl, w = self.n, self.kl, self.kl + self.ku
+
+        # Forward: apply the row swaps and L column by column
+        for k in range(n - 1):
+            p = self.piv[k]
+            if p != k:
+                x[[k, p]] = x[[p, k]]
+            m = min(kl, n - 1 - k)
+            if m > 0:
+                x[k+1:k+m+1] -= np.multiply.outer(self.L_cols[k, :m], x[k])
+
+        # Back Substitution with the banded U
+        for i in range(n - 1, -1, -1):
+            cols = min(w, n - 1 - i)
+            if cols > 0:
+                x[i] -= self.U_rows[i, 1:cols+1] @ x[i+1:i+cols+1]
+            x[i] /= self.U_rows[i, 0]
+        return x
+
+    # A^T x = b: solve U^T y = b, then apply L^T and the swaps in reverse order
+    def _solve_transpose_array(self, b):
+        if self.lapack:
+            return self._solve_lapack(b, 1)
+        x = np.array(self._check_rhs(b))
+        n, kl, w = self.n, self.kl, self.kl + self.ku
+
+        # U^T is lower triangular: row i collects U[i - t, i] for t = 1 .. w
+        for i in range(n):
+            t = np.arange(1, min(w, i) + 1)
+            if len(t):
+                x[i] -= self.U_rows[i - t, t] @ x[i - t]
+            x[i] /= self.U_rows[i, 0]
+
+        for k in range(n - 2, -1, -1):
+            m = min(kl, n - 1 - k)
+            if m > 0:
+                x[k] -= self.L_cols[k, :m] @ x[k+1:k+m+1]
+            p = self.piv[k]
+            if p != k:
+                x[[k, p]] = x[[p, k]]
+        return x
@@ -0,0 +1,140 @@
+import numpy as np
+
+
+# Gaussian Elimination with Partial Pivoting on a stack of small systems
+def batched_partial_pivoting(A, b):
+    """
+    Solves A[k] x[k] = b[k] for every k with one elimination sweep over the
+    whole batch (loop count depends on n, not on the batch size).
+
+    Parameters:
+    A -> stack of coefficient matrices, shape (batch, n, n)
+    b -> stack of right-hand sides, shape (batch, n) or (batch, n, m)
+
+    Returns:
+    x        -> solutions with the shape of b (NaN for singular members)
+    singular -> boolean mask (batch,), True where a zero pivot was met
+    """
+    A = np.array(A, dtype=float)       # Working copies, input left untouched
+    b = np.array(b, dtype=float)
+    vector_rhs = b.ndim == 2
+    if vector_rhs:
+        b = b[:, :, None]              # Treat every RHS as a single column
+    batch, n = A.shape[0], A.shape[1]
+    members = np.arange(batch)
+    singular = np.zeros(batch, dtype=bool)
+
+    # Forward Elimination with Partial Pivoting, all systems at once
+    for i in range(n):
+        # Step 1: Pivot row of every member (largest |value| in column i)
+        max_row = np.argmax(np.abs(A[:, i:, i]), axis=1) + i
+
+        # Step 2: Swap rows i and max_row in A and b for each member
+        _swap_rows(A, members, i, max_row)
+        _swap_rows(b, members, i, max_row)
+
+        # Zero pivot even after swapping -> flag the member, keep the others going
+        pivot = A[:, i, i]
+        zero = pivot == 0
+        singular |= zero
+        pivot = np.where(zero, 1.0, pivot)
+
+        # Step 3: Eliminate entries below the pivot in every member
+        factors = A[:, i+1:, i] / pivot[:, None]
+        A[:, i+1:, i:] -= factors[:, :, None] * A[:, None, i, i:]
+        b[:, i+1:] -= factors[:, :, None] * b[:, None, i]
+
+    # Back Substitution, one row of all members per step
+    diag = np.diagonal(A, axis1=1, axis2=2).copy()
+    diag[singular] = 1.0
+    x = np.zeros_like(b)
+    for i in range(n - 1, -1, -1):
+        result = np.einsum("bj,bjm->bm", A[:, i, i+1:], x[:, i+1:])
+        x[:, i] = (b[:, i] - result) / diag[:, i, None]
+
+    x[singular] = np.nan
+    if vector_rhs:
+        x = x[:, :, 0]
+    return x, singular
+
+
+# Swap row i with row p[b] of every member b of a stack (in place)
+def _swap_rows(M, members, i, p):
+    row_i = M[:, i].copy()
+    M[:, i] = M[members, p]
+    M[members, p] = row_i
+
+
+# Solve L X = B in place for unit lower triangular L, all members at once
+def _solve_unit_lower(L, B, leaf_size):
+    m = L.shape[1]
+    if m <= leaf_size:
+        for i in range(1, m):
+            B[:, i] -= (L[:, i, None, :i] @ B[:, :i])[:, 0]
+        return
+    h = m // 2
+    _solve_unit_lower(L[:, :h, :h], B[:, :h], leaf_size)
+    B[:, h:] -= L[:, h:, :h] @ B[:, :h]
+    _solve_unit_lower(L[:, h:, h:], B[:, h:], leaf_size)
+
+
+# Recursive pivoted LU of the columns of P (batch, m, w) in place, returns local pivots
+def _factor_columns(P, members, leaf_size):
+    batch, m, w = P.shape
+    pivots = np.empty((batch, w), dtype=int)
+
+    if w <= leaf_size:
+        # Narrow panel: plain column-by-column elimination
+        for j in range(w):
+            p = np.argmax(np.abs(P[:, j:, j]), axis=1) + j
+            pivots[:, j] = p
+            _swap_rows(P, members, j, p)
+            pivot = P[:, j, j]
+            pivot = np.where(pivot == 0, 1.0, pivot)   # Zero column: multipliers stay 0
+            P[:, j+1:, j] /= pivot[:, None]
+            P[:, j+1:, j+1:] -= P[:, j+1:, j, None] * P[:, None, j, j+1:]
+        return pivots
+
+    # Left half first, then its swaps, U block and Schur complement for the right half
+    h = w // 2
+    pivots[:, :h] = _factor_columns(P[:, :, :h], members, leaf_size)
+    right = P[:, :, h:]
+    for j in range(h):
+        _swap_rows(right, members, j, pivots[:, j])
+    _solve_unit_lower(P[:, :h, :h], right[:, :h], leaf_size)
+    right[:, h:] -= P[:, h:, :h] @ right[:, :h]
+
+    # Right half, whose swaps are then applied to the finished left half
+    sub = _factor_columns(P[:, h:, h:], members, leaf_size)
+    pivots[:, h:] = sub + h
+    left = P[:, h:, :h]
+    for j in range(w - h):
+        _swap_rows(left, members, j, sub[:, j])
+    return pivots
+
+
+# LU with partial pivoting of every matrix in a stack (A[b][perm[b]] = L U)
+def batched_lu_factor(A, leaf_size=4):
+    """
+    Stacked version of lu.lu_factor. The matrix is split recursively into
+    column halves so almost all work is batched matrix products; only
+    panels of leaf_size columns are eliminated column by column.
+
+    Parameters:
+    A          -> stack of square matrices, shape (batch, n, n)
+    leaf_size  -> widest panel factored without further splitting
+
+    Returns:
+    LU   -> packed factors, shape (batch, n, n)
+    perm -> row permutations, shape (batch, n)
+    """
+    LU = np.array(A, dtype=float)
+    batch, n = LU.shape[0], LU.shape[1]
+    members = np.arange(batch)
+    pivots = _factor_columns(LU, members, leaf_size)
+
+    # Turn the sequence of row swaps into a permutation vector
+    perm = np.tile(np.arange(n), (batch, 1))
+    for j in range(n):
+        _swap_rows(perm[:, :, None], members, j, pivots[:, j])
+    return LU, perm
@@ -0,0 +1,184 @@
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+
+import numpy as np
+from determinant import slogdet
+from lu import lu_factor, lu_unpack
+from parallel_benchmark import time_best
+from structure import factorize
+
+# Reproducible benchmark of the SOLE kernels against numpy.linalg.
+#   python benchmark.py --output results.json
+#   python benchmark.py --baseline results.json --tolerance 25
+# The second run exits with status 1 when a kernel is more than 25 % slower
+# than in the stored results.
+
+SEED = 0
+SIZES = (100, 200, 400, 800)
+KINDS = ("dense", "diagonally_dominant", "banded", "ill_conditioned")
+BANDWIDTH = 4               # Sub- and super-diagonals of the banded matrices
+CONDITION = 1e10            # 2-norm condition number of the ill-conditioned matrices
+TOLERANCE = 25.0            # Allowed slow-down in percent before a run fails
+
+
+# Test matrix of the given kind, the same for every run with the same seed
+def make_matrix(kind, n, seed=SEED):
+    rng = np.random.default_rng([seed, n, KINDS.index(kind)])
+    A = rng.standard_normal((n, n))
+    if kind == "diagonally_dominant":
+        A += np.diag(np.sum(np.abs(A), axis=1))
+    elif kind == "banded":
+        i, j = np.indices((n, n))
+        A[np.abs(i - j) > BANDWIDTH] = 0.0
+        A += np.diag(np.sum(np.abs(A), axis=1))
+    elif kind == "ill_conditioned":
+        # A = Q1 diag(s) Q2^T with singular values from 1 down to 1 / CONDITION
+        Q1, _ = np.linalg.qr(A)
+        Q2, _ = np.linalg.qr(rng.standard_normal((n, n)))
+        A = (Q1 * np.logspace(0, -np.log10(CONDITION), n)) @ Q2.T
+    return A
+
+
+# Relative residual ||A X - B|| / (||A|| ||X|| + ||B||), infinity norms
+def relative_residual(A, X, B):
+    R = A @ X - B
+    scale = np.linalg.norm(A, np.inf) * np.max(np.abs(X)) + np.max(np.abs(B))
+    return float(np.max(np.abs(R)) / scale) if scale > 0 else 0.0
+
+
+# Every kernel: (ours, numpy baseline, flops, residual); ours / baseline take (A, b)
+# and the script functions are measured through the library path they call
+def _solve_residual(A, b, x):
+    return relative_residual(A, x, b)
+
+
+def _lu_residual(A, b, result):
+    LU, perm = result
+    L, U = lu_unpack(LU)
+    return float(np.max(np.abs(A[perm] - L @ U)) / np.max(np.abs(A)))
+
+
+def _inverse_residual(A, b, X):
+    return relative_residual(A, X, np.eye(A.shape[0]))
+
+
+def _determinant_residual(A, b, result):
+    sign, logdet = result
+    ref_sign, ref_logdet = np.linalg.slogdet(A)
+    return float(abs(logdet - ref_logdet) / max(abs(ref_logdet), 1.0) + abs(sign - ref_sign))
+
+
+KERNELS = {
+    "GaussElimination": (lambda A, b: factorize(A, pivot=False).solve(b),
+                         lambda A, b: np.linalg.solve(A, b),
+                         lambda n: 2 * n**3 / 3 + 2 * n**2, _solve_residual),
+    "Partial_Pivoting": (lambda A, b: factorize(A).solve(b),
+                         lambda A, b: np.linalg.solve(A, b),
+                         lambda n: 2 * n**3 / 3 + 2 * n**2, _solve_residual),
+    "LU_Decomposition": (lambda A, b: lu_factor(A),
+                         lambda A, b: np.linalg.slogdet(A),      # LAPACK getrf
+                         lambda n: 2 * n**3 / 3, _lu_residual),
+    "InverseMatrix":    (lambda A, b: factorize(A).solve(np.eye(A.shape[0])),
+                         lambda A, b: np.linalg.inv(A),
+                         lambda n: 2 * n**3, _inverse_residual),
+    "determinant":      (lambda A, b: slogdet(A),
+                         lambda A, b: np.linalg.slogdet(A),
+                         lambda n: 2 * n**3 / 3, _determinant_residual),
+}
+
+
+# Peak memory allocated while running func once (bytes, as seen by tracemalloc)
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes=SIZES, kinds=KINDS, kernels=tuple(KERNELS), repeats=3):
+    """
+    Runs every kernel on every kind of matrix and size.
+
+    Returns a list of records (one per kernel, kind and n) with wall time
+    (best of repeats, after one untimed warm-up call),
+    peak memory, effective GFLOP/s (dense flop count / time) and the
+    relative residual, for our kernel and for numpy.linalg.
+    """
+    records = []
+    for kind in kinds:
+        for n in sizes:
+            A = make_matrix(kind, n)
+            b = np.random.default_rng([SEED, n]).standard_normal(n)
+            for name in kernels:
+                ours, baseline, flops, residual = KERNELS[name]
+                record = {"kernel": name, "kind": kind, "n": n}
+                for label, func in (("ours", ours), ("numpy", baseline)):
+                    seconds = time_best(lambda: func(A, b), repeats)
+                    record[label] = {
+                        "time": seconds,
+                        "peak_bytes": peak_memory(lambda: func(A, b)),
+                        "gflops": flops(n) / seconds / 1e9 if seconds > 0 else None,
+                    }
+                record["ours"]["residual"] = residual(A, b, ours(A, b))
+                records.append(record)
+                gflops = record["ours"]["gflops"]    # None when the timer read 0
+                rate = f"{gflops:7.2f}" if gflops is not None else f"{'-':>7}"
+                print(f"{name:<18}{kind:<21}{n:>6}  {record['ours']['time']:9.4f} s"
+                      f"  numpy {record['numpy']['time']:9.4f} s"
+                      f"  {rate} GFLOP/s"
+                      f"  residual {record['ours']['residual']:.2e}")
+    return records
+
+
+def compare(records, baseline_records, tolerance=TOLERANCE):
+    """
+    Compares our times with a stored run of the same benchmark.
+
+    Returns the list of (kernel, kind, n, old time, new time) that got more
+    than tolerance percent slower.
+    """
+    old = {(r["kernel"], r["kind"], r["n"]): r["ours"]["time"] for r in baseline_records}
+    slower = []
+    for r in records:
+        key = (r["kernel"], r["kind"], r["n"])
+        if key in old and r["ours"]["time"] > old[key] * (1 + tolerance / 100):
+            slower.append(key + (old[key], r["ours"]["time"]))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the SOLE solvers against numpy.linalg.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--kinds", nargs="+", default=list(KINDS), choices=KINDS)
+    parser.add_argument("--kernels", nargs="+", default=list(KERNELS), choices=list(KERNELS))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed slow-down in percent (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    records = run(args.sizes, args.kinds, args.kernels, args.repeats)
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump({"seed": SEED, "numpy": np.__version__, "python": platform.python_version(),
+                       "machine": platform.machine(), "results": records}, fh, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            slower = compare(records, json.load(fh)["results"], args.tolerance)
+        for kernel, kind, n, old, new in slower:
+            print(f"Regression: {kernel} on {kind} n={n}: {old:.4f} s -> {new:.4f} s")
+        if slower:
+            return 1
+        print(f"No kernel is more than {args.tolerance:g} % slower than the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
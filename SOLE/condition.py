@@ -0,0 +1,62 @@
+import numpy as np
+
+# Warn when the estimated condition number exceeds this (about 1 / sqrt(eps))
+ILL_CONDITIONED = 1e8
+
+
+class SolveResult:
+    """
+    Solution plus the reliability signals gathered while factoring.
+
+    x             -> solution (or inverse / block of the inverse)
+    pivot_growth  -> max|U| / max|A|, large values mean unstable elimination
+    condition     -> estimate of the 1-norm condition number of A
+    refinement_steps, fell_back -> steps of the last mixed-precision solve and
+                     whether it fell back to float64 (None without refinement)
+    """
+
+    def __init__(self, x, pivot_growth, condition, refinement_steps=None, fell_back=None):
+        self.x = x
+        self.pivot_growth = pivot_growth
+        self.condition = condition
+        self.refinement_steps = refinement_steps
+        self.fell_back = fell_back
+
+    @property
+    def ill_conditioned(self):
+        return not self.condition < ILL_CONDITIONED
+
+    def __repr__(self):
+        return (f"SolveResult(pivot_growth={self.pivot_growth:.3g}, "
+                f"condition={self.condition:.3g})")
+
+
+# Hager's algorithm with Higham's refinements (LAPACK dlacon), O(n^2) per solve
+def inverse_norm1_estimate(solve, solve_transpose, n, max_iter=5):
+    """
+    Estimates ||A^-1||_1 from a few solves with A and A^T.
+
+    solve, solve_transpose -> functions returning A^-1 v and A^-T v
+    """
+    x = np.full(n, 1.0 / n)
+    estimate = 0.0
+    previous_j = -1
+    for it in range(max_iter):
+        y = solve(x)
+        y_norm = np.sum(np.abs(y))
+        if it > 0 and y_norm <= estimate:      # No further increase
+            break
+        estimate = y_norm
+        xi = np.where(y >= 0, 1.0, -1.0)
+        z = solve_transpose(xi)
+        j = int(np.argmax(np.abs(z)))
+        if it > 0 and (j == previous_j or np.abs(z[j]) <= z @ x):
+            break
+        previous_j = j
+        x = np.zeros(n)
+        x[j] = 1.0
+
+    # Higham's extra test vector guards against badly chosen unit vectors
+    alt = (-1.0) ** np.arange(n) * (1.0 + np.arange(n) / max(n - 1, 1))
+    alt_estimate = 2.0 * np.sum(np.abs(solve(alt))) / (3.0 * n)
+    return max(estimate, alt_estimate)
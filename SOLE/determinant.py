@@ -0,0 +1,36 @@
+import numpy as np
+from batched import batched_lu_factor
+from lu import lu_factor, perm_sign
+from symmetric import is_symmetric, symmetric_factorize
+
+
+# Sign and log|det| from packed LU factors (single matrix or stack)
+def slogdet_from_lu(LU, perm):
+    """
+    det(A) = sign(P) * prod(diag(U)), evaluated as a sum of logarithms so
+    that it never overflows or underflows.
+
+    Returns:
+    sign   -> +1, -1 or 0 (singular)
+    logdet -> log|det(A)| (-inf when singular)
+    """
+    diag = np.diagonal(LU, axis1=-2, axis2=-1)
+    sign = perm_sign(perm) * np.prod(np.sign(diag), axis=-1)
+    sign = np.where(sign == 0, 0.0, sign)     # No negative zero for singular A
+    with np.errstate(divide="ignore"):
+        logdet = np.sum(np.log(np.abs(diag)), axis=-1)
+    return sign, logdet
+
+
+# slogdet of A (n x n) or of every matrix of a stack (batch, n, n) in one call
+def slogdet(A):
+    A = np.asarray(A, dtype=float)
+    if A.ndim == 2 and is_symmetric(A):
+        return symmetric_factorize(A).slogdet()     # Cholesky / LDL^T, half the work
+    if A.ndim == 2:
+        LU, perm = lu_factor(A)
+    else:
+        shape = A.shape
+        LU, perm = batched_lu_factor(A.reshape((-1,) + shape[-2:]))
+        LU, perm = LU.reshape(shape), perm.reshape(shape[:-1])
+    return slogdet_from_lu(LU, perm)
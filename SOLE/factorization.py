@@ -0,0 +1,138 @@
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from condition import inverse_norm1_estimate
+from lu import column_chunks, lu_factor, matrix_norm1, max_abs, pivot_growth
+from substitution import solve_lower, solve_upper
+
+
+# True when b is an array whose buffer can hold a solution of this dtype
+def _is_buffer(b, dtype):
+    return isinstance(b, np.ndarray) and b.dtype == dtype and b.flags.writeable
+
+
+class Factorization:
+    """
+    Base class for stored factorizations: subclasses set self.n,
+    self.singular, self.norm1 (||A||_1) and self.growth (pivot growth) and
+    implement _solve_array / _solve_transpose_array for (n,) and (n, k) inputs.
+    """
+
+    # Check the shape of a right-hand side and convert it to float
+    def _check_rhs(self, b):
+        b = np.asarray(b, dtype=float)
+        if b.shape[0] != self.n:
+            raise ValueError(f"Right-hand side has {b.shape[0]} rows, expected {self.n}.")
+        return b
+
+    # Lazily solve a stream of right-hand side vectors
+    def _solve_stream(self, bs):
+        for b in bs:
+            yield self._solve_array(b)
+
+    def solve(self, b, overwrite_b=False):
+        """
+        Solves A x = b with the stored factors.
+
+        b           -> vector (n,), block of columns (n, k) or an iterator of vectors
+        overwrite_b -> write the solution into b's own buffer when b is a
+                       writable float array (b is destroyed)
+
+        Returns the solution with the same shape as b, or a generator of
+        solutions when b is an iterator.
+        """
+        if self.singular:
+            raise ValueError("Zero pivot element detected. Cannot solve.")
+        if isinstance(b, Iterator):
+            return self._solve_stream(b)
+        if overwrite_b:
+            return self._solve_in_place(b)
+        return self._solve_array(b)
+
+    # Solution stored in b itself; subclasses override this to avoid the copy
+    def _solve_in_place(self, b):
+        x = self._solve_array(b)
+        if not _is_buffer(b, x.dtype) or b.shape != x.shape:
+            return x
+        b[...] = x
+        return b
+
+    # Solves A^T x = b with the same factors
+    def solve_transpose(self, b):
+        if self.singular:
+            raise ValueError("Zero pivot element detected. Cannot solve.")
+        return self._solve_transpose_array(b)
+
+    # Estimated 1-norm condition number, O(n^2) using the stored factors
+    def condition_estimate(self):
+        if self.singular:
+            return np.inf
+        inverse_norm = inverse_norm1_estimate(self.solve, self.solve_transpose, self.n)
+        return self.norm1 * inverse_norm
+
+
+class LUFactorization(Factorization):
+    """
+    Factor once, solve many: keeps the packed LU factors and the row
+    permutation of A, so every later solve costs only O(n^2).
+
+    Parameters:
+    A        -> square coefficient matrix (n x n)
+    pivot    -> use partial pivoting (False gives plain Gaussian elimination)
+    workers  -> threads used by the factorization and by block solves
+    dtype    -> precision of the stored factors and of the substitutions
+    overwrite_a -> factor in A's own buffer (A is destroyed, no n x n copy)
+    """
+
+    def __init__(self, A, pivot=True, workers=1, dtype=np.float64, overwrite_a=False):
+        A = np.asarray(A)
+        # Norms of A first: with overwrite_a its entries are gone after factoring
+        self.norm1 = matrix_norm1(A)
+        a_max = max_abs(A)
+        self.LU, self.perm = lu_factor(A, pivot=pivot, workers=workers, dtype=dtype,
+                                       overwrite_a=overwrite_a)
+        self.n = self.LU.shape[0]
+        self.workers = workers
+        self.growth = pivot_growth(A, self.LU, a_max=a_max)
+        # A zero pivot means the system has no unique solution
+        self.singular = bool(np.any(np.diagonal(self.LU) == 0))
+
+    # Forward and back substitution in place on x = Pb
+    def _substitute(self, x):
+        solve_lower(self.LU, x, unit_diagonal=True, out=x)  # Solve L y = Pb in place
+        return solve_upper(self.LU, x, out=x)           # Solve U x = y in place
+
+    # Solve one right-hand side (n,) or a block of columns (n, k)
+    def _solve_array(self, b):
+        b = self._check_rhs(b)
+        x = b[self.perm].astype(self.LU.dtype, copy=False)  # Apply P (fresh copy of b)
+        return self._solve_permuted(x)
+
+    # Permute and substitute inside b's buffer
+    def _solve_in_place(self, b):
+        if not _is_buffer(b, self.LU.dtype):
+            return super()._solve_in_place(b)
+        self._check_rhs(b)
+        b[...] = b[self.perm]           # Apply P (temporary of one right-hand side)
+        return self._solve_permuted(b)
+
+    # Substitutions on an already permuted right-hand side x (overwritten)
+    def _solve_permuted(self, x):
+        if self.workers == 1 or x.ndim == 1 or x.shape[1] < 2:
+            return self._substitute(x)
+
+        # Independent column chunks of the block are solved on separate threads
+        with ThreadPoolExecutor(self.workers) as pool:
+            chunks = column_chunks(0, x.shape[1], self.workers)
+            list(pool.map(lambda c: self._substitute(x[:, c[0]:c[1]]), chunks))
+        return x
+
+    # A^T = U^T L^T P: solve U^T, then L^T, then undo the row permutation
+    def _solve_transpose_array(self, b):
+        y = self._check_rhs(b).astype(self.LU.dtype)
+        solve_upper(self.LU, y, trans=True, out=y)
+        solve_lower(self.LU, y, unit_diagonal=True, trans=True, out=y)
+        x = np.empty_like(y)
+        x[self.perm] = y
+        return x
@@ -0,0 +1,116 @@
+from collections import OrderedDict
+
+import numpy as np
+from structure import factorize
+
+# Memory allowed for cached columns of the inverse (bytes)
+CACHE_BYTES = 64 * 2**20
+# Columns solved together when sweeping over the whole inverse
+SWEEP_COLUMNS = 256
+
+
+class InverseOperator:
+    """
+    A^-1 as an operator: holds the factors of A and applies the inverse on
+    demand, O(n^2) per vector instead of building the n x n inverse.
+
+    Columns are computed lazily and kept in a least-recently-used cache of
+    at most cache_bytes; the full dense inverse is built only by todense().
+
+    Parameters:
+    A              -> square matrix (dense, banded, symmetric or scipy sparse)
+    factorization  -> existing Factorization of A to reuse instead of A
+    cache_bytes    -> memory budget for cached columns
+
+    Usage:
+    Ainv @ v, Ainv.solve_transpose(v), Ainv.column(j), Ainv.columns([...]),
+    Ainv.row(i), Ainv.entry(i, j), Ainv.diagonal(), Ainv.todense()
+    """
+
+    def __init__(self, A=None, factorization=None, cache_bytes=CACHE_BYTES):
+        self.factorization = factorization if factorization is not None else factorize(A)
+        if self.factorization.singular:
+            raise ValueError("Zero pivot element detected. Matrix is singular.")
+        self.n = self.factorization.n
+        self.shape = (self.n, self.n)
+        self.max_columns = max(1, cache_bytes // (8 * max(self.n, 1)))
+        self._cache = OrderedDict()             # j -> column j of A^-1
+
+    # A^-1 v for a vector (n,) or a block (n, k)
+    def __matmul__(self, v):
+        return self.factorization.solve(v)
+
+    def solve(self, v):
+        return self.factorization.solve(v)
+
+    # A^-T v, i.e. v^T A^-1 as a column
+    def solve_transpose(self, v):
+        return self.factorization.solve_transpose(v)
+
+    # Identity columns e_j for the given indices, as one (n, k) block
+    def _unit_block(self, indices):
+        E = np.zeros((self.n, len(indices)))
+        E[indices, np.arange(len(indices))] = 1.0
+        return E
+
+    def columns(self, indices):
+        """
+        Columns of A^-1 as an (n, k) array. Cached columns are reused, the
+        missing ones are solved together as one block and then cached.
+        """
+        indices = np.arange(self.n)[indices]     # Normalise slices / lists / negatives
+        missing = [j for j in dict.fromkeys(indices.tolist()) if j not in self._cache]
+        fresh = {}
+        if missing:
+            block = self.factorization.solve(self._unit_block(missing))
+            fresh = {j: block[:, t] for t, j in enumerate(missing)}
+        out = np.empty((self.n, len(indices)))
+        for t, j in enumerate(indices.tolist()):
+            out[:, t] = fresh[j] if j in fresh else self._cache[j]
+        for j in indices.tolist():
+            self._remember(j, fresh.get(j))
+        return out
+
+    def column(self, j):
+        return self.columns([j])[:, 0]
+
+    # Row i of A^-1 is column i of A^-T (not cached)
+    def row(self, i):
+        e = np.zeros(self.n)
+        e[i] = 1.0
+        return self.factorization.solve_transpose(e)
+
+    def entry(self, i, j):
+        return float(self.column(j)[i])
+
+    # Put / refresh column j in the LRU cache, evicting the oldest ones
+    def _remember(self, j, column):
+        if j in self._cache:
+            self._cache.move_to_end(j)
+            return
+        if column is None:
+            return
+        self._cache[j] = column.copy()
+        while len(self._cache) > self.max_columns:
+            self._cache.popitem(last=False)
+
+    def diagonal(self, indices=None):
+        """
+        Diagonal of A^-1 (or only the entries (i, i) for the given indices),
+        solved SWEEP_COLUMNS columns at a time without keeping the columns.
+        """
+        indices = np.arange(self.n)[slice(None) if indices is None else indices]
+        d = np.empty(len(indices))
+        for t0 in range(0, len(indices), SWEEP_COLUMNS):
+            part = indices[t0:t0 + SWEEP_COLUMNS]
+            block = self.factorization.solve(self._unit_block(part))
+            d[t0:t0 + len(part)] = block[part, np.arange(len(part))]
+        return d
+
+    # Full dense inverse, n x n (the only call that materializes it)
+    def todense(self):
+        inverse = np.empty(self.shape)
+        for j0 in range(0, self.n, SWEEP_COLUMNS):
+            j1 = min(j0 + SWEEP_COLUMNS, self.n)
+            inverse[:, j0:j1] = self.factorization.solve(self._unit_block(np.arange(j0, j1)))
+        return inverse
@@ -0,0 +1,172 @@
+import numpy as np
+
+
+# Turn a dense array, a sparse matrix or a callable into a matvec function
+def _as_matvec(A):
+    if callable(A):
+        return A
+    return lambda v: A @ v
+
+
+# Diagonal of A (dense or sparse); a matrix-free operator must supply it
+def _diagonal(A, diag):
+    if diag is not None:
+        return np.asarray(diag, dtype=float)
+    if callable(A):
+        raise ValueError("A matrix-free operator needs its diagonal passed as diag.")
+    return np.asarray(A.diagonal(), dtype=float).ravel()
+
+
+# Same RHS convention as GaussElimination: a column (n, 1) becomes a 1D vector
+def _prepare(b, x0):
+    b = np.asarray(b, dtype=float).flatten()
+    x = np.zeros_like(b) if x0 is None else np.array(x0, dtype=float).flatten()  # Warm start
+    return b, x
+
+
+# Residual norm relative to ||b|| (absolute when b = 0)
+def _relative(r, b_norm):
+    return np.linalg.norm(r) / b_norm if b_norm > 0 else np.linalg.norm(r)
+
+
+# Jacobi iteration x <- x + D^-1 (b - A x), one matvec per sweep
+def jacobi(A, b, x0=None, tol=1e-10, max_iter=1000, diag=None):
+    """
+    Jacobi method for A x = b.
+
+    Parameters:
+    A         -> dense array, sparse matrix or callable matvec(v) = A v
+    b         -> right-hand side, vector (n,) or column (n, 1)
+    x0        -> starting guess (e.g. a previous solution), zeros by default
+    tol       -> stop when ||b - A x|| / ||b|| <= tol
+    max_iter  -> maximum number of sweeps
+    diag      -> diagonal of A (required when A is a callable)
+
+    Returns:
+    x         -> approximate solution (None if a diagonal entry is zero)
+    residuals -> relative residual norm after every sweep (index 0 = start)
+    """
+    matvec = _as_matvec(A)
+    D = _diagonal(A, diag)
+    if np.any(D == 0):
+        print("Zero diagonal element detected. Cannot apply Jacobi iteration.")
+        return None, []
+    b, x = _prepare(b, x0)
+    b_norm = np.linalg.norm(b)
+
+    r = b - matvec(x)
+    residuals = [_relative(r, b_norm)]
+    for _ in range(max_iter):
+        if residuals[-1] <= tol:
+            break
+        x += r / D
+        r = b - matvec(x)
+        residuals.append(_relative(r, b_norm))
+    if residuals[-1] > tol:                 # The last sweep may have just met tol
+        print(f"Jacobi did not converge in {max_iter} iterations.")
+    return x, residuals
+
+
+# Row access for SOR sweeps: (columns, values) of row i for dense or CSR input
+def _row_getter(A):
+    if callable(A):
+        raise ValueError("Gauss-Seidel / SOR need the matrix entries, not only a matvec.")
+    if hasattr(A, "tocsr"):                     # Any scipy.sparse format
+        A = A.tocsr()
+        indptr, indices, data = A.indptr, A.indices, A.data
+        return lambda i: (indices[indptr[i]:indptr[i+1]], data[indptr[i]:indptr[i+1]])
+    A = np.asarray(A, dtype=float)
+    columns = np.arange(A.shape[1])
+    return lambda i: (columns, A[i])
+
+
+# Successive Over-Relaxation; omega = 1 gives Gauss-Seidel
+def sor(A, b, omega=1.5, x0=None, tol=1e-10, max_iter=1000):
+    """
+    SOR method for A x = b (A dense or sparse, updated in place row by row).
+
+    Parameters are as for jacobi, plus:
+    omega -> relaxation factor, 0 < omega < 2
+
+    Returns:
+    x, residuals -> as for jacobi
+    """
+    row = _row_getter(A)
+    D = _diagonal(A, None)
+    if np.any(D == 0):
+        print("Zero diagonal element detected. Cannot apply SOR iteration.")
+        return None, []
+    b, x = _prepare(b, x0)
+    b_norm = np.linalg.norm(b)
+    matvec = _as_matvec(A)
+    n = len(b)
+
+    residuals = [_relative(b - matvec(x), b_norm)]
+    for _ in range(max_iter):
+        if residuals[-1] <= tol:
+            break
+        for i in range(n):
+            cols, vals = row(i)
+            sigma = vals @ x[cols] - D[i] * x[i]   # Sum over j != i with latest x
+            x[i] += omega * ((b[i] - sigma) / D[i] - x[i])
+        residuals.append(_relative(b - matvec(x), b_norm))
+    if residuals[-1] > tol:                 # The last sweep may have just met tol
+        print(f"SOR did not converge in {max_iter} iterations.")
+    return x, residuals
+
+
+# Gauss-Seidel = SOR without relaxation
+def gauss_seidel(A, b, x0=None, tol=1e-10, max_iter=1000):
+    return sor(A, b, omega=1.0, x0=x0, tol=tol, max_iter=max_iter)
+
+
+# (Preconditioned) Conjugate Gradient for symmetric positive definite A
+def conjugate_gradient(A, b, x0=None, tol=1e-10, max_iter=None, precondition=False, diag=None):
+    """
+    Conjugate Gradient method for symmetric positive definite A.
+
+    Parameters are as for jacobi, plus:
+    precondition -> use the diagonal (Jacobi) preconditioner M = diag(A)
+    max_iter     -> defaults to n
+
+    Returns:
+    x, residuals -> as for jacobi
+    """
+    matvec = _as_matvec(A)
+    b, x = _prepare(b, x0)
+    b_norm = np.linalg.norm(b)
+    if max_iter is None:
+        max_iter = len(b)
+    if precondition:
+        D = _diagonal(A, diag)
+        if np.any(D <= 0):
+            print("Diagonal preconditioner needs a positive diagonal.")
+            return None, []
+        apply_M = lambda r: r / D
+    else:
+        apply_M = lambda r: r
+
+    r = b - matvec(x)
+    z = apply_M(r)
+    p = z.copy()
+    rz = r @ z
+    residuals = [_relative(r, b_norm)]
+    for _ in range(max_iter):
+        if residuals[-1] <= tol:
+            break
+        Ap = matvec(p)
+        pAp = p @ Ap
+        if pAp <= 0:
+            print("Matrix is not positive definite. Cannot continue Conjugate Gradient.")
+            return x, residuals
+        alpha = rz / pAp
+        x += alpha * p
+        r -= alpha * Ap
+        residuals.append(_relative(r, b_norm))
+        z = apply_M(r)
+        rz_new = r @ z
+        p = z + (rz_new / rz) * p
+        rz = rz_new
+    if residuals[-1] > tol:                 # The last sweep may have just met tol
+        print(f"Conjugate Gradient did not converge in {max_iter} iterations.")
+    return x, residuals
@@ -0,0 +1,140 @@
+import itertools
+import sys
+
+import numpy as np
+
+# Lines parsed per chunk by the text readers
+CHUNK_LINES = 4096
+
+
+# Keep data lines only: drop blanks and comment lines (# or %)
+def _data_lines(lines):
+    return [line for line in lines if line.strip() and line.lstrip()[0] not in "#%"]
+
+
+# Parse whitespace / comma separated numbers chunk by chunk into a 2-D array
+def _read_text(fh, first_lines=()):
+    blocks = []
+    delimiter = None
+    lines = iter(fh)
+    chunk = list(first_lines) + list(itertools.islice(lines, CHUNK_LINES))
+    while chunk:
+        data = _data_lines(chunk)
+        if data:
+            if not blocks and "," in data[0]:
+                delimiter = ","                 # CSV input
+            # NumPy's C parser converts the whole chunk in one call
+            blocks.append(np.loadtxt(data, delimiter=delimiter, ndmin=2))
+        chunk = list(itertools.islice(lines, CHUNK_LINES))
+    if not blocks:
+        raise ValueError("No numbers found in the input.")
+    if any(block.shape[1] != blocks[0].shape[1] for block in blocks):
+        raise ValueError("Rows of the text matrix have different lengths.")
+    return np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+
+
+# Read a Matrix Market file (coordinate or array, real/integer/pattern);
+# sparse=True returns coordinate files as scipy CSR matrices when scipy is installed
+def _read_matrix_market(fh, header, sparse=False):
+    fields = header.lower().split()
+    if len(fields) < 5 or fields[1] != "matrix":
+        raise ValueError("Unsupported Matrix Market header.")
+    layout, field, symmetry = fields[2], fields[3], fields[4]
+    if field == "complex":
+        raise ValueError("Complex Matrix Market files are not supported.")
+
+    lines = iter(fh)
+    size_line = next(line for line in lines if line.strip() and not line.startswith("%"))
+    sizes = [int(v) for v in size_line.split()]
+    rows, cols = sizes[0], sizes[1]
+    values = _read_text(lines) if sizes[-1] != 0 else np.zeros((0, 3))
+
+    if layout == "array":                       # Dense, column-major, one value per line
+        A = np.ascontiguousarray(values.ravel().reshape(cols, -1).T)
+        if symmetry != "general":
+            raise ValueError("Only general Matrix Market arrays are supported.")
+        return A
+
+    i = values[:, 0].astype(int) - 1
+    j = values[:, 1].astype(int) - 1
+    v = np.ones(len(i)) if field == "pattern" else values[:, 2]
+    if symmetry in ("symmetric", "hermitian", "skew-symmetric"):
+        off = i != j                            # Mirror the stored triangle
+        sign = -1.0 if symmetry == "skew-symmetric" else 1.0
+        i, j, v = (np.concatenate((i, j[off])), np.concatenate((j, i[off])),
+                   np.concatenate((v, sign * v[off])))
+    if sparse:
+        try:
+            from scipy.sparse import coo_matrix
+            return coo_matrix((v, (i, j)), shape=(rows, cols)).tocsr()
+        except ImportError:
+            pass                                # No scipy: dense array below
+    A = np.zeros((rows, cols))
+    A[i, j] = v
+    return A
+
+
+# Load from an open text stream (stdin, pipe, file object)
+def _load_stream(fh, sparse=False):
+    first = fh.readline()
+    if first.startswith("%%MatrixMarket"):
+        return _read_matrix_market(fh, first, sparse)
+    return _read_text(fh, [first])
+
+
+def load_matrix(source, key=None, sparse=False):
+    """
+    Loads a matrix into a contiguous float64 array.
+
+    source -> path or open text stream ("-" means stdin)
+              .npy        memory-mapped read-only (no copy in RAM)
+              .npz        array named key (default: "A" or the first array)
+              .mtx / .mm  Matrix Market coordinate or array file
+              other       CSV or whitespace separated text
+    sparse -> return Matrix Market coordinate files as scipy CSR matrices
+    """
+    if source == "-":
+        return _load_stream(sys.stdin, sparse)
+    if hasattr(source, "read"):
+        return _load_stream(source, sparse)
+
+    path = str(source)
+    lower = path.lower()
+    if lower.endswith(".npy"):
+        A = np.load(path, mmap_mode="r")
+        if A.dtype == np.float64 and A.flags.c_contiguous:
+            return A
+        return np.ascontiguousarray(A, dtype=float)
+    if lower.endswith(".npz"):
+        with np.load(path) as data:
+            name = key or ("A" if "A" in data.files else data.files[0])
+            return np.ascontiguousarray(data[name], dtype=float)
+    with open(path) as fh:
+        if lower.endswith((".mtx", ".mm")):
+            return _read_matrix_market(fh, fh.readline(), sparse)
+        return _load_stream(fh, sparse)
+
+
+# Load a right-hand side as a 1-D vector
+def load_vector(source, key=None):
+    return np.array(load_matrix(source, key)).ravel()
+
+
+def load_system(sources, sparse=False):
+    """
+    Loads A and b for the solver scripts.
+
+    sources -> [A, b]  two sources (paths or "-")
+               [Ab]    one augmented matrix [A | b] with n + 1 columns,
+                       or one .npz file holding arrays "A" and "b"
+    sparse  -> keep a Matrix Market coordinate A sparse (see load_matrix)
+    """
+    if len(sources) == 1 and str(sources[0]).lower().endswith(".npz"):
+        return load_matrix(sources[0], "A"), load_vector(sources[0], "b")
+    if len(sources) == 1:
+        Ab = load_matrix(sources[0], sparse=sparse)
+        if hasattr(Ab, "tocsc"):
+            Ab = Ab.tocsc()                     # Cheap column slicing
+            return Ab[:, :-1].tocsr(), Ab[:, -1].toarray().ravel()
+        return Ab[:, :-1], np.array(Ab[:, -1])
+    return load_matrix(sources[0], sparse=sparse), load_vector(sources[1])
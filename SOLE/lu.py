@@ -0,0 +1,164 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from substitution import solve_lower
+
+# Default number of columns factored together in one panel
+BLOCK_SIZE = 64
+# Rows / columns per trailing-update product; bounds its temporary to
+# UPDATE_TILE x UPDATE_TILE numbers (2 MB) whatever the size of A
+UPDATE_TILE = 512
+
+
+# Factor one column panel A[k:, k:k+nb] with row-by-row rank-1 updates
+# (LU may also be a tall m x nb panel on its own, with k = 0)
+def _factor_panel(LU, perm, k, nb, pivot):
+    end = k + nb
+    for j in range(k, end):
+        if pivot:
+            # Row with the largest absolute value in column j becomes the pivot row
+            p = np.argmax(np.abs(LU[j:, j])) + j
+            if p != j:
+                LU[[j, p]] = LU[[p, j]]         # Swap whole rows (already factored part too)
+                perm[[j, p]] = perm[[p, j]]
+
+        if LU[j, j] == 0:                       # Zero pivot: leave column, caller checks diagonal
+            continue
+
+        LU[j+1:, j] /= LU[j, j]                 # Multipliers (column of L)
+        # Rank-1 update restricted to the remaining columns of this panel
+        LU[j+1:, j+1:end] -= np.outer(LU[j+1:, j], LU[j, j+1:end])
+
+
+# Block row of U and trailing update for the columns c0:c1 of one panel step
+def _update_columns(LU, k, end, c0, c1):
+    # Step 2: solve L11 * U12 = A12 (unit lower triangular)
+    U12 = LU[k:end, c0:c1]
+    solve_lower(LU[k:end, k:end], U12, unit_diagonal=True, out=U12)
+    # Step 3: rank-nb update of the trailing columns, in UPDATE_TILE tiles
+    for j0 in range(c0, c1, UPDATE_TILE):
+        j1 = min(j0 + UPDATE_TILE, c1)
+        for i0 in range(end, LU.shape[0], UPDATE_TILE):
+            i1 = min(i0 + UPDATE_TILE, LU.shape[0])
+            LU[i0:i1, j0:j1] -= LU[i0:i1, k:end] @ LU[k:end, j0:j1]
+
+
+# Split the columns start:n into one contiguous chunk per worker
+def column_chunks(start, n, workers):
+    edges = np.linspace(start, n, min(workers, n - start) + 1).astype(int)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+# Blocked right-looking LU factorization (PA = LU)
+def lu_factor(A, block_size=BLOCK_SIZE, pivot=True, workers=1, dtype=np.float64,
+              overwrite_a=False):
+    """
+    Computes the LU factorization of a square matrix panel by panel.
+
+    Parameters:
+    A           -> square matrix (n x n)
+    block_size  -> number of columns per panel
+    pivot       -> use partial (row) pivoting
+    workers     -> threads sharing the U12 solve and trailing update of every
+                   panel step (NumPy releases the GIL inside these kernels;
+                   limit the BLAS thread count when using more than one)
+    dtype       -> working precision of the factors (e.g. np.float32)
+    overwrite_a -> factor in A's own buffer when A is a writable array of
+                   that dtype (no n x n copy; A is destroyed)
+
+    Returns:
+    LU   -> n x n array holding L below the diagonal (unit diagonal implied)
+            and U on and above the diagonal
+    perm -> row permutation, so that A[perm] = L @ U
+    """
+    if overwrite_a and isinstance(A, np.ndarray) and A.dtype == dtype and A.flags.writeable:
+        LU = A                        # Caller's buffer becomes the packed factors
+    else:
+        LU = np.array(A, dtype=dtype)     # Single working copy, L and U packed together
+    n = LU.shape[0]
+    perm = np.arange(n)
+
+    pool = ThreadPoolExecutor(workers) if workers > 1 else None
+    try:
+        for k in range(0, n, block_size):
+            nb = min(block_size, n - k)
+            end = k + nb
+
+            # Step 1: Factor the current column panel
+            _factor_panel(LU, perm, k, nb, pivot)
+            if end == n:
+                break
+
+            # Steps 2-3: U12 block row and trailing update, column chunks in parallel
+            if pool is None:
+                _update_columns(LU, k, end, end, n)
+            else:
+                tasks = [pool.submit(_update_columns, LU, k, end, c0, c1)
+                         for c0, c1 in column_chunks(end, n, workers)]
+                for task in tasks:
+                    task.result()
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return LU, perm
+
+
+# Largest |a_ij| of A, or of its part on and above diagonal k, one block of
+# rows at a time so that no n x n temporary is created
+def max_abs(A, k=None, block_size=BLOCK_SIZE):
+    a_max = 0.0
+    for i0 in range(0, A.shape[0], block_size):
+        block = np.abs(A[i0:i0 + block_size])
+        if k is not None:
+            block = np.triu(block, i0 + k)
+        if block.size:
+            a_max = max(a_max, float(np.max(block)))
+    return a_max
+
+
+# ||A||_1 (largest absolute column sum), accumulated over blocks of rows
+def matrix_norm1(A, block_size=BLOCK_SIZE):
+    sums = np.zeros(A.shape[1])
+    for i0 in range(0, A.shape[0], block_size):
+        sums += np.sum(np.abs(A[i0:i0 + block_size]), axis=0)
+    return float(np.max(sums)) if sums.size else 0.0
+
+
+# Pivot growth factor max|U| / max|A| of a finished factorization
+# (pass a_max when A itself has been overwritten by the factors)
+def pivot_growth(A, LU, a_max=None):
+    if a_max is None:
+        a_max = max_abs(A)
+    u_max = max_abs(LU, k=0)
+    return float(u_max / a_max) if a_max > 0 else 1.0
+
+
+# Split packed LU storage into separate L and U matrices
+def lu_unpack(LU):
+    L = np.tril(LU, -1) + np.eye(LU.shape[0])
+    U = np.triu(LU)
+    return L, U
+
+
+# Sign (+1 / -1) of a row permutation, or of every permutation in a stack (..., n)
+def perm_sign(perm):
+    p = np.array(perm).reshape(-1, np.shape(perm)[-1])
+    batch, n = p.shape
+    members = np.arange(batch)
+    where = np.argsort(p, axis=1)          # where[b, v] = position of value v
+    sign = np.ones(batch, dtype=int)
+    # Sort every permutation with at most n - 1 swaps; each swap flips the sign
+    for i in range(n):
+        move = p[:, i] != i
+        if not move.any():
+            continue
+        b = members[move]
+        j = where[b, i]                    # Position currently holding value i
+        v = p[b, i]
+        p[b, i], p[b, j] = i, v
+        where[b, i], where[b, v] = i, j
+        sign[move] = -sign[move]
+    if np.ndim(perm) == 1:
+        return int(sign[0])
+    return sign.reshape(np.shape(perm)[:-1])
@@ -0,0 +1,186 @@
+import json
+import os
+
+import numpy as np
+from lu import _factor_panel
+from substitution import solve_lower, solve_upper
+
+# Columns per panel and rows per trailing-update tile
+PANEL_SIZE = 256
+TILE_ROWS = 1024
+
+
+# Write a small file atomically: temp file first, then rename over the target
+def _atomic_save(path, save):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as fh:
+        save(fh)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+def _save_state(work_dir, state):
+    _atomic_save(os.path.join(work_dir, "state.json"),
+                 lambda fh: fh.write(json.dumps(state).encode()))
+
+
+def _load_state(work_dir):
+    path = os.path.join(work_dir, "state.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as fh:
+        return json.load(fh)
+
+
+# Size and modification time of the matrix file, recorded after every flush
+def _fingerprint(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _clear(work_dir, names=("step.npz", "tile.npz", "state.json")):
+    for name in names:
+        try:
+            os.remove(os.path.join(work_dir, name))
+        except FileNotFoundError:
+            pass
+
+
+def ooc_lu_factor(path, panel_size=PANEL_SIZE, tile_rows=TILE_ROWS, work_dir=None):
+    """
+    Out-of-core LU factorization with partial pivoting of a matrix stored
+    in a .npy file. The file is memory-mapped and overwritten with the
+    packed L and U factors; only one column panel, one block row of U and
+    one tile of tile_rows rows are held in memory at a time.
+
+    Rows are never moved on disk: pivoting is recorded in perm, so that
+    A[perm] = L @ U with the packed factors equal to mm[perm].
+
+    Progress is checkpointed in work_dir (default: path + ".ooc") after
+    every panel and every tile, so calling the function again after an
+    interruption resumes where it stopped. The checkpoint records the shape,
+    size and modification time of the file and is discarded (fresh start)
+    when they no longer match, e.g. after a new matrix was saved to path.
+    It is removed when the factorization finishes, so a second call
+    factors the file again.
+
+    Parameters:
+    path        -> .npy file holding the square float64 matrix A
+    panel_size  -> columns factored together per step
+    tile_rows   -> rows per trailing-update tile (bounds resident memory)
+    work_dir    -> directory for the checkpoint files
+
+    Returns:
+    mm   -> read/write memmap of the file (packed LU, original row order)
+    perm -> row permutation
+    """
+    mm = np.lib.format.open_memmap(path, mode="r+")
+    n = mm.shape[0]
+    if mm.dtype != np.float64 or mm.shape != (n, n):
+        raise ValueError("Out-of-core LU needs a square float64 matrix.")
+    work_dir = work_dir or path + ".ooc"
+    os.makedirs(work_dir, exist_ok=True)
+    step_file = os.path.join(work_dir, "step.npz")
+    tile_file = os.path.join(work_dir, "tile.npz")
+
+    # file is None while writes to the matrix may be pending (interrupted
+    # mid-write: the journal replays them), else the fingerprint after a flush
+    def checkpoint(k, phase, tile, clean=True):
+        state = {"k": k, "phase": phase, "tile": tile, "shape": [n, n],
+                 "file": _fingerprint(path) if clean else None}
+        _save_state(work_dir, state)
+        return state
+
+    state = _load_state(work_dir)
+    stale = (state is None or state.get("shape") != [n, n]
+             or state.get("file") not in (None, _fingerprint(path)))
+    if stale:                               # Fresh start (no or outdated checkpoint)
+        _clear(work_dir)
+        state = checkpoint(0, "panel", 0)
+    # The permutation of the last logged step (identity before the first one)
+    perm = np.arange(n)
+    if state["k"] > 0 or state["phase"] == "update":
+        perm = np.load(step_file)["perm"]
+
+    while state["k"] < n:
+        k = state["k"]
+        end = min(k + panel_size, n)
+
+        if state["phase"] == "panel":
+            # Step 1: Factor the panel in memory (the file is not touched yet)
+            rest = perm[k:]
+            panel = np.array(mm[rest, k:end])
+            local = np.arange(len(rest))
+            _factor_panel(panel, local, 0, end - k, True)
+            perm[k:] = rest[local]
+
+            # Step 2: Block row of U for the nb pivot rows
+            U12 = np.array(mm[perm[k:end], end:])
+            solve_lower(panel[:end - k], U12, unit_diagonal=True, out=U12)
+
+            # Log the step before writing it, so a crash can replay it
+            _atomic_save(step_file, lambda fh: np.savez(fh, panel=panel, U12=U12, perm=perm))
+            state = checkpoint(k, "update", 0, clean=False)
+
+        step = np.load(step_file)
+        panel, U12, perm = step["panel"], step["U12"], step["perm"]
+
+        # Overwrites below are idempotent, so replaying them after a crash is safe
+        if state["file"] is not None:
+            state = checkpoint(k, "update", state["tile"], clean=False)
+        mm[perm[k:], k:end] = panel
+        mm[perm[k:end], end:] = U12
+
+        # Step 3: Trailing update, one tile of rows at a time (row order is free)
+        L21_rows = perm[end:]
+        order = np.argsort(L21_rows)        # Visit rows in file order for locality
+        first = state["tile"]
+        for t, start in enumerate(range(0, len(order), tile_rows)):
+            if t < first:
+                continue
+            sel = order[start:start + tile_rows]
+            rows = L21_rows[sel]
+            # Only the first tile after a restart can have a pending journal entry
+            journal = np.load(tile_file) if t == first and os.path.exists(tile_file) else None
+            if journal is not None and journal["k"] == k and journal["t"] == t:
+                new = journal["values"]      # Interrupted while copying: replay
+            else:
+                new = mm[rows, end:] - panel[end - k + sel] @ U12
+                _atomic_save(tile_file, lambda fh: np.savez(fh, k=k, t=t, values=new))
+            if state["file"] is not None:
+                state = checkpoint(k, "update", t, clean=False)
+            mm[rows, end:] = new
+            mm.flush()
+            state = checkpoint(k, "update", t + 1)
+
+        mm.flush()
+        state = checkpoint(end, "panel", 0)
+
+    _clear(work_dir)
+    try:
+        os.rmdir(work_dir)                  # Left in place if it holds other files
+    except OSError:
+        pass
+    return mm, perm
+
+
+# Solve A x = b with out-of-core factors, reading tile_rows rows at a time
+def ooc_lu_solve(mm, perm, b, tile_rows=TILE_ROWS):
+    n = mm.shape[0]
+    x = np.array(b, dtype=float)[perm]
+
+    # Forward substitution L y = Pb, block row by block row
+    for i0 in range(0, n, tile_rows):
+        i1 = min(i0 + tile_rows, n)
+        block = np.array(mm[perm[i0:i1]])
+        x[i0:i1] -= block[:, :i0] @ x[:i0]
+        solve_lower(block[:, i0:i1], x[i0:i1], unit_diagonal=True, out=x[i0:i1])
+
+    # Back substitution U x = y, from the last block row upwards
+    for i1 in range(n, 0, -tile_rows):
+        i0 = max(i1 - tile_rows, 0)
+        block = np.array(mm[perm[i0:i1]])
+        x[i0:i1] -= block[:, i1:] @ x[i1:]
+        solve_upper(block[:, i0:i1], x[i0:i1], out=x[i0:i1])
+    return x
@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+
+import numpy as np
+from factorization import LUFactorization
+from lu import lu_factor
+
+# Threaded LU scaling: time lu_factor and a block solve for 1, 2, 4, ... workers.
+# Run with the BLAS library limited to one thread per worker, e.g.
+#   OMP_NUM_THREADS=1 OPENBLAS_NUM_THREADS=1 MKL_NUM_THREADS=1 python parallel_benchmark.py 4000
+# so the speed-up comes from the panel-parallel update and not from BLAS itself.
+
+
+# Best of repeats timed calls, after warmup untimed calls (caches, lazy imports,
+# first-touch page faults and BLAS thread start-up are not timed)
+def time_best(func, repeats=3, warmup=1):
+    for _ in range(warmup):
+        func()
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    cores = os.cpu_count() or 1
+    rng = np.random.default_rng(0)
+    A = rng.standard_normal((n, n))
+    B = rng.standard_normal((n, 64))
+
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+
+    print(f"n = {n}, cores = {cores}")
+    print(f"{'workers':<10}{'factor (s)':<14}{'speed-up':<12}{'solve (s)':<14}{'speed-up':<12}")
+    base_factor = base_solve = None
+    for workers in counts:
+        t_factor = time_best(lambda: lu_factor(A, workers=workers))
+        factorization = LUFactorization(A, workers=workers)
+        t_solve = time_best(lambda: factorization.solve(B))
+        base_factor = base_factor or t_factor
+        base_solve = base_solve or t_solve
+        print(f"{workers:<10}{t_factor:<14.3f}{base_factor / t_factor:<12.2f}"
+              f"{t_solve:<14.3f}{base_solve / t_solve:<12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import numpy as np
+from factorization import Factorization, LUFactorization
+
+# Maximum number of float64 correction steps before falling back
+MAX_REFINEMENT_STEPS = 30
+
+
+class MixedPrecisionLU(Factorization):
+    """
+    Mixed-precision iterative refinement: A is factored in float32 with
+    partial pivoting, every solve starts from the float32 solution and then
+    corrects it with float64 residuals r = b - A x, reusing the float32
+    factors for each correction. When refinement stalls (or the float32
+    factors are unusable) it falls back to a float64 factorization.
+
+    Parameters:
+    A          -> square coefficient matrix (n x n)
+    max_steps  -> correction steps allowed per solve before falling back
+
+    After each solve:
+    steps      -> number of refinement steps used by the last solve
+    fell_back  -> True once the float64 factorization is in use
+    """
+
+    def __init__(self, A, max_steps=MAX_REFINEMENT_STEPS):
+        self.A = np.asarray(A, dtype=float)
+        self.n = self.A.shape[0]
+        self.max_steps = max_steps
+        self.steps = 0
+        with np.errstate(over="ignore"):            # Out-of-range entries become inf
+            self.low = LUFactorization(self.A, dtype=np.float32)
+        self.high = None
+        # Stopping test of LAPACK's dsgesv: ||r|| <= ||x|| * ||A|| * eps * sqrt(n)
+        self.threshold = np.linalg.norm(self.A, np.inf) * np.finfo(float).eps * np.sqrt(self.n)
+
+        self.norm1 = self.low.norm1
+        self.growth = self.low.growth
+
+        usable = not self.low.singular and np.all(np.isfinite(np.diagonal(self.low.LU)))
+        if not usable:                      # Zero pivot or overflow in float32
+            self._fall_back()
+        self.singular = self.high.singular if self.high is not None else False
+
+    @property
+    def fell_back(self):
+        return self.high is not None
+
+    def _fall_back(self):
+        if self.high is None:
+            self.high = LUFactorization(self.A)
+            self.norm1, self.growth = self.high.norm1, self.high.growth
+
+    # Refine the float32 solution of M x = b using float64 residuals b - M x
+    def _refine(self, b, low_solve, matvec):
+        x = low_solve(b).astype(float)
+        previous = np.inf
+        for step in range(1, self.max_steps + 1):
+            r = b - matvec(x)                         # Residual in float64
+            r_norm = np.max(np.abs(r), axis=0)
+            x_norm = np.max(np.abs(x), axis=0)
+            if np.all(r_norm <= x_norm * self.threshold):
+                self.steps = step - 1
+                return x
+            # Stalled: the residual no longer shrinks by at least half
+            if np.max(r_norm) > 0.5 * previous:
+                break
+            previous = np.max(r_norm)
+            x += low_solve(r)                         # Correction with float32 factors
+
+        # Refinement did not reach double accuracy -> full float64 solve
+        self.steps = step
+        self._fall_back()
+        return None
+
+    # Estimated with the current factors directly: the estimator's own solves
+    # must not overwrite steps or trigger a fall back
+    def condition_estimate(self):
+        if self.singular:
+            return np.inf
+        return (self.high if self.high is not None else self.low).condition_estimate()
+
+    def _solve_array(self, b):
+        b = self._check_rhs(b)
+        if self.high is None:
+            x = self._refine(b, self.low.solve, lambda v: self.A @ v)
+            if x is not None:
+                return x
+        else:
+            self.steps = 0
+        return self.high.solve(b)
+
+    def _solve_transpose_array(self, b):
+        b = self._check_rhs(b)
+        if self.high is None:
+            x = self._refine(b, self.low.solve_transpose, lambda v: self.A.T @ v)
+            if x is not None:
+                return x
+        else:
+            self.steps = 0
+        return self.high.solve_transpose(b)
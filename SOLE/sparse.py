@@ -0,0 +1,401 @@
+import numpy as np
+from condition import SolveResult
+from factorization import Factorization
+from lu import BLOCK_SIZE, _factor_panel, _update_columns
+from substitution import solve_lower, solve_upper
+
+try:                                    # Optional: compiled RCM ordering, SuperLU
+    from scipy.sparse import csc_matrix, csr_matrix
+    from scipy.sparse.csgraph import reverse_cuthill_mckee
+    from scipy.sparse.linalg import splu
+except ImportError:
+    reverse_cuthill_mckee = splu = None
+
+# Smallest block size of the block-tridiagonal factors (amortizes Python overhead)
+MIN_BLOCK = 32
+# The block-tridiagonal storage (about 4 * n * b numbers) may use at most this
+# fraction of the n^2 entries of the dense matrix; wider patterns are refused
+BAND_LIMIT = 0.25
+
+
+# Row pointers, column indices and values of A (scipy sparse or dense array)
+def _csr_arrays(A):
+    if hasattr(A, "tocsr"):                     # Any scipy.sparse format
+        A = A.tocsr()
+        n = A.shape[0]
+        indptr, indices, data = A.indptr, A.indices, np.asarray(A.data, dtype=float)
+    else:
+        A = np.asarray(A, dtype=float)
+        n = A.shape[0]
+        rows, indices = np.nonzero(A)
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n))))
+        data = A[rows, indices]
+    if A.shape != (n, n):
+        raise ValueError("Sparse elimination needs a square matrix.")
+    return n, indptr, indices, data
+
+
+# Adjacency lists of the symmetric pattern of A + A^T, without the diagonal
+def _adjacency(n, indptr, indices):
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    r = np.concatenate((rows, indices))
+    c = np.concatenate((indices, rows))
+    keep = r != c
+    key = np.unique(r[keep].astype(np.int64) * n + c[keep])
+    r, c = key // n, key % n
+    adj_ptr = np.concatenate(([0], np.cumsum(np.bincount(r, minlength=n))))
+    return adj_ptr, c
+
+
+# Cuthill-McKee breadth-first search from start, one whole level per step:
+# nodes of the next level are ordered by parent position, then by degree
+def _cuthill_mckee(adj_ptr, adj, degree, start, visited):
+    levels = [np.array([start])]
+    visited[start] = True
+    while True:
+        frontier = levels[-1]
+        counts = degree[frontier]
+        total = int(counts.sum())
+        if total == 0:
+            break
+        first = np.repeat(adj_ptr[frontier], counts)
+        offset = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        neighbours = adj[first + offset]
+        parent = np.repeat(np.arange(len(frontier)), counts)
+        new = ~visited[neighbours]
+        neighbours, parent = neighbours[new], parent[new]
+        if len(neighbours) == 0:
+            break
+        sort = np.lexsort((degree[neighbours], parent))
+        neighbours = neighbours[sort]
+        _, first_seen = np.unique(neighbours, return_index=True)
+        level = neighbours[np.sort(first_seen)]
+        visited[level] = True
+        levels.append(level)
+    return levels
+
+
+# Reverse Cuthill-McKee ordering: a permutation that keeps nonzeros near the diagonal
+def rcm_ordering(A):
+    """
+    Fill-reducing symmetric ordering of the pattern of A + A^T.
+
+    A -> scipy sparse matrix or dense array (only the pattern is used)
+
+    Returns:
+    order -> permutation, A[order][:, order] has a small bandwidth
+    """
+    n, indptr, indices, _ = _csr_arrays(A)
+    return _rcm(n, indptr, indices)
+
+
+def _rcm(n, indptr, indices):
+    if reverse_cuthill_mckee is not None and n:
+        pattern = csr_matrix((np.ones(len(indices)), indices, indptr), shape=(n, n))
+        return np.asarray(reverse_cuthill_mckee(pattern, symmetric_mode=False), dtype=int)
+
+    adj_ptr, adj = _adjacency(n, indptr, indices)
+    degree = np.diff(adj_ptr)
+    visited = degree == 0
+    order = [np.flatnonzero(visited)]           # Isolated nodes need no search
+    candidates = np.argsort(degree, kind="stable")
+    c = 0
+    while True:
+        # Each connected component starts from a pseudo-peripheral node:
+        # repeat the search from a minimum-degree node of the last level
+        while c < n and visited[candidates[c]]:
+            c += 1
+        if c == n:
+            break
+        start = candidates[c]
+        depth = 0
+        while True:
+            levels = _cuthill_mckee(adj_ptr, adj, degree, start, visited.copy())
+            if len(levels) <= depth:
+                break
+            depth = len(levels)
+            last = levels[-1]
+            start = last[np.argmin(degree[last])]
+        levels = _cuthill_mckee(adj_ptr, adj, degree, start, visited)
+        order.extend(levels)
+    return np.concatenate(order)[::-1]
+
+
+# Numbers stored by the block-tridiagonal factors with b x b blocks
+def _band_storage(n, b):
+    N = max(-(-n // b), 1)
+    return N * 2 * b * b + (N - 1) * 2 * b * b
+
+
+class SparseAnalysis:
+    """
+    Symbolic analysis of a sparsity pattern, reusable for every matrix with
+    the same pattern (e.g. each step of a time-dependent problem):
+
+    order   -> reverse Cuthill-McKee permutation of the rows and columns
+    kl, ku  -> lower / upper bandwidth of the reordered pattern
+    b       -> block size; the reordered matrix is block tridiagonal with
+               b x b blocks, and partial pivoting keeps every fill-in
+               inside the blocks of the factors
+    slots   -> position of every stored entry inside the factor storage,
+               so a new matrix is loaded with a single scatter
+
+    Only patterns that RCM turns into a narrow band are accepted: when the
+    storage would exceed BAND_LIMIT * n^2 (random or arrowhead patterns,
+    where b approaches n) a ValueError is raised; SuperLUFactorization
+    handles those with real fill-reducing sparse elimination.
+
+    Parameters:
+    A           -> scipy sparse matrix (CSR / CSC / ...) or dense array
+    block_size  -> block size (default: max(kl, ku, MIN_BLOCK), or max(kl, ku)
+                   when the MIN_BLOCK padding alone would exceed the limit)
+    """
+
+    def __init__(self, A, block_size=None):
+        n, indptr, indices, _ = _csr_arrays(A)
+        self.n = n
+        self.indptr, self.indices = np.array(indptr), np.array(indices)
+        self.order = _rcm(n, indptr, indices)
+        position = np.empty(n, dtype=int)
+        position[self.order] = np.arange(n)
+
+        # Row / column of every entry in the reordered matrix
+        i = position[np.repeat(np.arange(n), np.diff(indptr))]
+        j = position[indices]
+        self.kl = int(np.max(i - j, initial=0))
+        self.ku = int(np.max(j - i, initial=0))
+        width = max(self.kl, self.ku)
+        b = block_size or max(width, MIN_BLOCK)
+        if b < width:
+            raise ValueError(f"Block size must be at least the bandwidth {width}.")
+        limit = max(BAND_LIMIT * n * n, 16 * MIN_BLOCK**2)
+        if block_size is None and _band_storage(n, b) > limit:
+            b = max(width, 1)               # MIN_BLOCK padding alone breaks the limit
+        self.b = b
+        self.blocks = N = max(-(-n // b), 1)
+
+        # Storage: N tall panels [A_ii; A_i+1,i] (2b x b), then N - 1 block
+        # rows [A_i,i+1  A_i,i+2] (b x 2b) receiving U12 and its fill-in
+        self.panel_size = N * 2 * b * b
+        self.size = _band_storage(n, b)
+        if self.size > limit:
+            raise ValueError(f"Reordered bandwidth {width} is too wide for the block-tridiagonal "
+                             f"solver ({self.size} stored numbers with block size {b} for "
+                             f"n = {n}); use SuperLUFactorization (scipy) or a dense solver.")
+        bi, bj, ri, rj = i // b, j // b, i % b, j % b
+        panel = np.where(bi == bj, bi * 2 * b * b + ri * b + rj,       # Diagonal block
+                         bj * 2 * b * b + (b + ri) * b + rj)            # Sub-diagonal block
+        upper = self.panel_size + (bi * b + ri) * 2 * b + rj            # Super-diagonal block
+        self.slots = np.where(bj > bi, upper, panel)
+
+    # True when (indptr, indices) is the pattern this analysis was made for
+    def matches(self, indptr, indices):
+        return np.array_equal(indptr, self.indptr) and np.array_equal(indices, self.indices)
+
+
+# Blocked LU with partial pivoting of a tall panel P (m x nb, m >= nb)
+def _factor_tall(P, perm, block_size=BLOCK_SIZE):
+    cols = P.shape[1]
+    for k in range(0, cols, block_size):
+        end = min(k + block_size, cols)
+        _factor_panel(P, perm, k, end - k, True)
+        if end < cols:
+            _update_columns(P, k, end, end, cols)
+
+
+class SparseLUFactorization(Factorization):
+    """
+    Sparse Gaussian elimination with partial pivoting. A is reordered by
+    reverse Cuthill-McKee, which makes it block tridiagonal; block step i
+    factors the tall panel [A_ii; A_i+1,i] and updates the next block row,
+    so only O(n * b) numbers are stored and every operation is a dense
+    b x b kernel. The n x n matrix is never formed.
+
+    Parameters:
+    A         -> scipy sparse matrix or dense array (n x n)
+    analysis  -> SparseAnalysis of A's pattern (computed when omitted)
+    """
+
+    def __init__(self, A, analysis=None):
+        n, indptr, indices, data = _csr_arrays(A)
+        if analysis is None:
+            analysis = SparseAnalysis(A)
+        elif not analysis.matches(indptr, indices):
+            raise ValueError("Sparsity pattern differs from the symbolic analysis.")
+        self.analysis = analysis
+        self.n = n
+        self.norm1 = float(np.max(np.bincount(indices, weights=np.abs(data), minlength=n),
+                                  initial=0.0))
+        a_max = float(np.max(np.abs(data), initial=0.0))
+
+        b, N = analysis.b, analysis.blocks
+        # Step 1: Scatter the entries into the block storage (duplicates are summed)
+        factors = np.bincount(analysis.slots, weights=data, minlength=analysis.size)
+        self.panels = factors[:analysis.panel_size].reshape(N, 2 * b, b)
+        self.U12 = factors[analysis.panel_size:].reshape(N - 1, b, 2 * b)
+        pad = np.arange(n, N * b) - (N - 1) * b
+        self.panels[N - 1, pad, pad] = 1.0          # Identity rows up to N * b equations
+        self.perms = np.zeros((N, 2 * b), dtype=int)
+
+        for i in range(N):
+            # Step 2: Factor the panel, pivot rows come from block rows i and i + 1
+            rows = b if i == N - 1 else 2 * b
+            P = self.panels[i, :rows]
+            perm = np.arange(rows)
+            _factor_tall(P, perm)
+            self.perms[i, :rows] = perm
+            if i == N - 1:
+                break
+
+            # Step 3: Same row swaps and elimination on the block columns i+1, i+2
+            width = 2 * b if i + 2 < N else b
+            R = np.empty((2 * b, width))
+            R[:b] = self.U12[i, :, :width]
+            R[b:, :b] = self.panels[i + 1, :b]
+            if width > b:
+                R[b:, b:] = self.U12[i + 1, :, :b]
+            R = R[perm]
+            solve_lower(P[:b], R[:b], unit_diagonal=True, out=R[:b])
+            R[b:] -= P[b:] @ R[:b]
+            self.U12[i, :, :width] = R[:b]
+            self.panels[i + 1, :b] = R[b:, :b]
+            if width > b:
+                self.U12[i + 1, :, :b] = R[b:, b:]
+
+        U_diag = np.diagonal(self.panels[:, :b], axis1=1, axis2=2)
+        self.singular = bool(np.any(U_diag == 0))
+        u_max = max(np.max(np.abs(np.triu(self.panels[:, :b])), initial=0.0),
+                    np.max(np.abs(self.U12), initial=0.0))
+        self.growth = float(u_max / a_max) if a_max > 0 else 1.0
+
+    # Right-hand side in the reordered numbering, padded to N * b rows
+    def _permuted(self, b):
+        b = self._check_rhs(b)
+        x = np.zeros((self.analysis.blocks * self.analysis.b,) + b.shape[1:])
+        x[:self.n] = b[self.analysis.order]
+        return x
+
+    def _unpermuted(self, x):
+        y = np.empty((self.n,) + x.shape[1:])
+        y[self.analysis.order] = x[:self.n]
+        return y
+
+    def _solve_array(self, b):
+        x = self._permuted(b)
+        bs, N = self.analysis.b, self.analysis.blocks
+
+        # Forward: swaps and L of every panel act on block rows i and i + 1
+        for i in range(N):
+            rows = bs if i == N - 1 else 2 * bs
+            P = self.panels[i, :rows]
+            t = x[i * bs:i * bs + rows][self.perms[i, :rows]]
+            solve_lower(P[:bs], t[:bs], unit_diagonal=True, out=t[:bs])
+            if rows > bs:
+                t[bs:] -= P[bs:] @ t[:bs]
+            x[i * bs:i * bs + rows] = t
+
+        # Back Substitution with the block upper bidiagonal U
+        for i in range(N - 1, -1, -1):
+            r = x[i * bs:(i + 1) * bs]
+            if i < N - 1:
+                width = 2 * bs if i + 2 < N else bs
+                r -= self.U12[i, :, :width] @ x[(i + 1) * bs:(i + 1) * bs + width]
+            solve_upper(self.panels[i, :bs], r, out=r)
+        return self._unpermuted(x)
+
+    # A^T x = b: U^T block row by block row, then the panels in reverse order
+    def _solve_transpose_array(self, b):
+        z = self._permuted(b)
+        bs, N = self.analysis.b, self.analysis.blocks
+
+        for j in range(N):
+            r = z[j * bs:(j + 1) * bs]
+            if j >= 1:
+                r -= self.U12[j - 1, :, :bs].T @ z[(j - 1) * bs:j * bs]
+            if j >= 2:
+                r -= self.U12[j - 2, :, bs:].T @ z[(j - 2) * bs:(j - 1) * bs]
+            solve_upper(self.panels[j, :bs], r, trans=True, out=r)
+
+        for i in range(N - 1, -1, -1):
+            rows = bs if i == N - 1 else 2 * bs
+            P = self.panels[i, :rows]
+            t = z[i * bs:i * bs + rows].copy()
+            if rows > bs:
+                t[:bs] -= P[bs:].T @ t[bs:]
+            solve_lower(P[:bs], t[:bs], unit_diagonal=True, trans=True, out=t[:bs])
+            z[i * bs + self.perms[i, :rows]] = t     # Undo the panel's row swaps
+        return self._unpermuted(z)
+
+
+class SuperLUFactorization(Factorization):
+    """
+    General sparse LU from scipy's SuperLU: COLAMD column ordering with a
+    symbolic fill analysis and threshold partial pivoting. Storage follows
+    the fill-in of the factors instead of a band, so irregular patterns
+    (random, arrowhead, ...) stay sparse.
+
+    Parameters:
+    A -> scipy sparse matrix or dense array (n x n)
+    """
+
+    def __init__(self, A):
+        A = csc_matrix(A, dtype=float)
+        n = A.shape[0]
+        if A.shape != (n, n):
+            raise ValueError("Sparse elimination needs a square matrix.")
+        self.n = n
+        A_abs = abs(A)
+        self.norm1 = float(A_abs.sum(axis=0).max()) if A.nnz else 0.0
+        a_max = float(A_abs.max()) if A.nnz else 0.0
+        try:
+            self.lu = splu(A)
+        except RuntimeError:                    # SuperLU: "Factor is exactly singular"
+            self.lu, self.singular, self.growth = None, True, 1.0
+            return
+        self.singular = False
+        u_max = float(abs(self.lu.U).max()) if self.lu.U.nnz else 0.0
+        self.growth = u_max / a_max if a_max > 0 else 1.0
+
+    def _solve_array(self, b):
+        return self.lu.solve(self._check_rhs(b))
+
+    def _solve_transpose_array(self, b):
+        return self.lu.solve(self._check_rhs(b), trans="T")
+
+
+# Sparse LU for A: SuperLU when scipy is installed, otherwise (or when an
+# analysis is passed for reuse) the RCM block-tridiagonal factorization
+def sparse_factorize(A, analysis=None):
+    if analysis is None and splu is not None:
+        return SuperLUFactorization(A)
+    return SparseLUFactorization(A, analysis)
+
+
+# Gaussian Elimination with Partial Pivoting for sparse A
+def sparse_partial_pivoting(A, b, analysis=None, diagnostics=False):
+    """
+    Same interface and results as Partial_Pivoting, for sparse matrices.
+
+    Parameters:
+    A            -> scipy sparse matrix (CSR / CSC / ...) or dense array
+    b            -> vector (n,), column (n, 1), block (n, k) or iterator of vectors
+    analysis     -> SparseAnalysis of A's pattern; pass the same one for every
+                    matrix with this pattern to skip the ordering step (uses
+                    the block-tridiagonal solver instead of SuperLU)
+    diagnostics  -> return a SolveResult with pivot growth and condition estimate
+
+    Returns:
+    x (or SolveResult), None if a zero pivot is found
+    """
+    factorization = sparse_factorize(A, analysis)
+    if factorization.singular:
+        print("Zero pivot element detected. Cannot solve.")
+        return
+
+    if isinstance(b, np.ndarray) and b.ndim == 2 and b.shape[1] == 1:
+        b = b.reshape(-1)            # single column -> 1D vector
+
+    x = factorization.solve(b)
+    if diagnostics:
+        return SolveResult(x, factorization.growth, factorization.condition_estimate())
+    return x
@@ -0,0 +1,86 @@
+import numpy as np
+from banded import (BandedLUFactorization, TridiagonalFactorization, as_banded,
+                    to_banded, tridiagonal_diagonals, tridiagonal_to_banded)
+from factorization import LUFactorization
+from lu import BLOCK_SIZE
+from sparse import sparse_factorize
+from symmetric import is_symmetric, symmetric_factorize
+
+# Use the banded path when the stored band is at most this fraction of n
+BAND_FRACTION = 0.1
+
+
+# Lower and upper bandwidth (kl, ku) of a dense matrix, one block of rows at
+# a time so the temporaries stay BLOCK_SIZE x n
+def bandwidth(A, block_size=BLOCK_SIZE):
+    n_rows, n_cols = A.shape
+    kl = ku = 0
+    for i0 in range(0, n_rows, block_size):
+        nonzero = A[i0:i0 + block_size] != 0
+        occupied = nonzero.any(axis=1)
+        if not occupied.any():
+            continue
+        rows = np.arange(i0, i0 + len(nonzero))[occupied]
+        nonzero = nonzero[occupied]
+        first = np.argmax(nonzero, axis=1)                          # First nonzero column per row
+        last = n_cols - 1 - np.argmax(nonzero[:, ::-1], axis=1)     # Last nonzero column per row
+        kl = max(kl, int(np.max(rows - first)))
+        ku = max(ku, int(np.max(last - rows)))
+    return kl, ku
+
+
+# True when banded storage and elimination are worth it for this n
+def is_narrow_band(n, kl, ku):
+    return 2 * kl + ku + 1 <= BAND_FRACTION * n
+
+
+# Pick the cheapest factorization for the structure of A
+def factorize(A, pivot=True, overwrite_a=False, kl=None, ku=None):
+    """
+    Factors A with the best available method:
+    scipy sparse matrix       -> SuperLU sparse LU with COLAMD ordering
+                                 (always pivots)
+    tridiagonal (no pivoting) -> cyclic-reduction Thomas solver, O(n)
+    narrow band               -> banded LU, O(n * bw^2)
+    symmetric                 -> Cholesky if positive definite, else
+                                 Bunch-Kaufman LDL^T (LU without pivoting)
+    otherwise                 -> dense blocked LU, O(n^3)
+
+    overwrite_a -> let the dense paths factor in A's own buffer (A is destroyed)
+
+    A may also be passed in compact form, which never builds the n x n matrix:
+    (lower, diag, upper)  -> tuple of the three diagonals of a tridiagonal A
+                             (as for tridiagonal_solve)
+    band storage, kl, ku  -> rows of to_banded, or the kl + ku + 1 rows of the
+                             LAPACK band layout ab[ku + i - j, j] = A[i, j]
+
+    Returns a Factorization (attributes singular, solve).
+    """
+    if hasattr(A, "tocsr"):                     # Never densify a sparse matrix
+        return sparse_factorize(A)
+    if isinstance(A, tuple):                    # Tridiagonal A as (lower, diag, upper)
+        lower, diag, upper = (np.asarray(v, dtype=float) for v in A)
+        if not pivot:
+            return TridiagonalFactorization(lower, diag, upper)
+        return BandedLUFactorization(tridiagonal_to_banded(lower, diag, upper), 1, 1)
+    if kl is not None or ku is not None:        # A is already in band storage
+        kl, ku = kl or 0, ku or 0
+        ab = as_banded(A, kl, ku)
+        if kl <= 1 and ku <= 1 and not pivot:
+            d = kl + ku
+            lower = np.concatenate(([0.0], ab[d + 1, :-1])) if kl else np.zeros(ab.shape[1])
+            upper = np.concatenate((ab[d - 1, 1:], [0.0])) if ku else np.zeros(ab.shape[1])
+            return TridiagonalFactorization(lower, ab[d], upper)
+        return BandedLUFactorization(ab, kl, ku, pivot=pivot)
+    A = np.asarray(A, dtype=float)
+    n = A.shape[0]
+    kl, ku = bandwidth(A)
+    if not is_narrow_band(n, kl, ku):
+        if is_symmetric(A):
+            factorization = symmetric_factorize(A, pivot=pivot, overwrite_a=overwrite_a)
+            if factorization is not None:
+                return factorization
+        return LUFactorization(A, pivot=pivot, overwrite_a=overwrite_a)
+    if kl <= 1 and ku <= 1 and not pivot:
+        return TridiagonalFactorization(*tridiagonal_diagonals(A))
+    return BandedLUFactorization(to_banded(A, kl, ku), kl, ku, pivot=pivot)
@@ -0,0 +1,62 @@
+import numpy as np
+
+
+# Prepare the output buffer: copy b into out (or a new float array)
+def _init_out(T, b, out):
+    b = np.asarray(b)
+    if b.shape[0] != T.shape[0]:
+        raise ValueError(f"Right-hand side has {b.shape[0]} rows, expected {T.shape[0]}.")
+    if out is None:
+        return np.array(b, dtype=float)
+    if out is not b:
+        out[...] = b                # Caller's buffer, no new allocation
+    return out
+
+
+# Forward substitution T x = b, reading only the lower triangle of T
+def solve_lower(L, b, unit_diagonal=False, trans=False, out=None):
+    """
+    Solves L x = b (or L^T x = b when trans=True) for lower triangular L.
+
+    Parameters:
+    L              -> n x n array; only the lower triangle is read, so packed
+                      LU storage or strided / transposed views can be passed as is
+    b              -> right-hand side, vector (n,) or block of columns (n, k)
+    unit_diagonal  -> treat the diagonal of L as ones (Doolittle L factor)
+    trans          -> solve with L^T (done through a transposed view, no copy)
+    out            -> optional output buffer; may be b itself to solve in place
+
+    Returns:
+    x -> solution with the same shape as b
+    """
+    if trans:
+        return solve_upper(L.T, b, unit_diagonal=unit_diagonal, out=out)
+
+    x = _init_out(L, b, out)
+    n = L.shape[0]
+    for i in range(n):
+        if i > 0:
+            x[i] -= L[i, :i] @ x[:i]     # Whole-row update with known values
+        if not unit_diagonal:
+            x[i] /= L[i, i]
+    return x
+
+
+# Back substitution T x = b, reading only the upper triangle of T
+def solve_upper(U, b, unit_diagonal=False, trans=False, out=None):
+    """
+    Solves U x = b (or U^T x = b when trans=True) for upper triangular U.
+
+    Parameters are the same as for solve_lower.
+    """
+    if trans:
+        return solve_lower(U.T, b, unit_diagonal=unit_diagonal, out=out)
+
+    x = _init_out(U, b, out)
+    n = U.shape[0]
+    for i in range(n - 1, -1, -1):
+        if i < n - 1:
+            x[i] -= U[i, i+1:] @ x[i+1:]
+        if not unit_diagonal:
+            x[i] /= U[i, i]
+    return x
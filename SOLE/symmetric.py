@@ -0,0 +1,307 @@
+import numpy as np
+from factorization import Factorization, _is_buffer
+from lu import BLOCK_SIZE, matrix_norm1, max_abs
+from substitution import solve_lower
+
+# Relative tolerance (w.r.t. max|A|) of the symmetry check
+SYMMETRY_RTOL = 1e-12
+# Bunch-Kaufman pivot threshold (1 + sqrt(17)) / 8, bounds the element growth
+ALPHA = (1 + np.sqrt(17)) / 8
+
+
+# True when A equals A^T up to SYMMETRY_RTOL * max|A|
+def is_symmetric(A, rtol=SYMMETRY_RTOL, block_size=BLOCK_SIZE):
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        return False
+    n = A.shape[0]
+    if n == 0:
+        return True
+    tol = rtol * max_abs(A)                 # Blockwise, no n x n |A| temporary
+    # Quick rejection on the first row / column before the full O(n^2) pass
+    if np.any(np.abs(A[0] - A[:, 0]) > tol):
+        return False
+    # Compare block rows with block columns, no n x n temporary
+    for i0 in range(0, n, block_size):
+        i1 = min(i0 + block_size, n)
+        if np.any(np.abs(A[i0:i1, i0:] - A[i0:, i0:i1].T) > tol):
+            return False
+    return True
+
+
+# Blocked right-looking Cholesky factorization A = L L^T
+def cholesky_factor(A, block_size=BLOCK_SIZE, overwrite_a=False):
+    """
+    Computes the Cholesky factor of a symmetric positive definite matrix.
+    Only the lower triangle of A is read and overwritten (in a copy); the
+    trailing updates touch the lower triangle only, so the work is about
+    n^3 / 3 flops, half of LU.
+
+    Parameters:
+    A           -> symmetric matrix (n x n)
+    block_size  -> number of columns per panel
+    overwrite_a -> work in A's own buffer when it is a writable float64
+                   array (its lower triangle is destroyed, even on failure)
+
+    Returns:
+    L -> n x n array with the factor in its lower triangle (the strict
+         upper triangle keeps the entries of A), or None when A is not
+         positive definite
+    """
+    L = A if overwrite_a and _is_buffer(A, np.float64) else np.array(A, dtype=float)
+    n = L.shape[0]
+    for k in range(0, n, block_size):
+        end = min(k + block_size, n)
+
+        # Step 1: Factor the diagonal block column by column
+        for j in range(k, end):
+            d = L[j, j] - L[j, k:j] @ L[j, k:j]
+            if not d > 0:                       # Not positive definite (or NaN)
+                return None
+            L[j, j] = np.sqrt(d)
+            L[j+1:end, j] = (L[j+1:end, j] - L[j+1:end, k:j] @ L[j, k:j]) / L[j, j]
+        if end == n:
+            break
+
+        # Step 2: L21 = A21 L11^-T, i.e. solve L11 L21^T = A21^T in place
+        L21T = L[end:, k:end].T
+        solve_lower(L[k:end, k:end], L21T, out=L21T)
+
+        # Step 3: A22 -= L21 L21^T, one block column of the lower triangle at a time
+        for c0 in range(end, n, block_size):
+            c1 = min(c0 + block_size, n)
+            X = L[c0:c1, k:end]
+            L[c0:c1, c0:c1] -= np.tril(X @ X.T)     # Upper part of the block stays A
+            L[c1:, c0:c1] -= L[c1:, k:end] @ X.T
+    return L
+
+
+# Column j of the current trailing matrix, rows from j down, read from the
+# lower triangle; the updates of panel columns k0..p-1 are applied on the fly
+def _trailing_column(LD, F, k0, p, j):
+    column = np.concatenate((LD[j, p:j], LD[j:, j]))
+    column -= LD[p:, k0:p] @ F[j, :p - k0]
+    return column
+
+
+# Symmetric interchange of rows / columns i < q in lower triangle storage
+def _swap(LD, F, perm, i, q):
+    LD[[i, q], :i] = LD[[q, i], :i]             # Factored columns of L and the raw part
+    LD[q+1:, [i, q]] = LD[q+1:, [q, i]]
+    between = LD[i+1:q, i].copy()
+    LD[i+1:q, i] = LD[q, i+1:q]
+    LD[q, i+1:q] = between
+    LD[i, i], LD[q, q] = LD[q, q], LD[i, i]
+    F[[i, q]] = F[[q, i]]
+    perm[[i, q]] = perm[[q, i]]
+
+
+# Blocked Bunch-Kaufman LDL^T factorization of a symmetric (indefinite) matrix
+def ldl_factor(A, block_size=BLOCK_SIZE, overwrite_a=False):
+    """
+    Computes P A P^T = L D L^T with symmetric (Bunch-Kaufman) pivoting, D
+    made of 1 x 1 and 2 x 2 blocks. Columns of a panel are formed
+    left-looking from F = L D, then the lower triangle of the trailing
+    matrix gets one rank-nb update, so the work is about n^3 / 3 flops.
+
+    Parameters:
+    A           -> symmetric matrix (n x n), only the lower triangle is read
+    block_size  -> number of columns per panel
+    overwrite_a -> factor in A's own buffer when it is a writable float64 array
+
+    Returns:
+    LD   -> n x n array with the unit lower triangular L strictly below the
+            diagonal and the diagonal of D on the diagonal
+    e    -> sub-diagonal of D (e[j] != 0 where a 2 x 2 block starts at j)
+    perm -> symmetric permutation, so that A[perm][:, perm] = L D L^T
+    """
+    LD = A if overwrite_a and _is_buffer(A, np.float64) else np.array(A, dtype=float)
+    n = LD.shape[0]
+    e = np.zeros(max(n - 1, 0))
+    perm = np.arange(n)
+    F = np.zeros((n, block_size + 1))       # L D for the columns of one panel
+
+    k0 = 0
+    while k0 < n:
+        stop = min(k0 + block_size, n)
+        p = k0
+        while p < stop:
+            # Step 1: Choose a 1 x 1 or 2 x 2 pivot from the updated column p
+            column = _trailing_column(LD, F, k0, p, p)
+            a_pp = abs(column[0])
+            col_max = np.max(np.abs(column[1:])) if p + 1 < n else 0.0
+            size, q = 1, p
+            if max(a_pp, col_max) > 0 and a_pp < ALPHA * col_max:
+                r = p + 1 + int(np.argmax(np.abs(column[1:])))
+                column_r = _trailing_column(LD, F, k0, p, r)
+                row_max = np.max(np.abs(np.delete(column_r, r - p)))
+                if a_pp * row_max >= ALPHA * col_max ** 2:
+                    pass                                    # Keep p
+                elif abs(column_r[r - p]) >= ALPHA * row_max:
+                    q = r                                   # 1 x 1 pivot from row r
+                else:
+                    size, q = 2, r                          # 2 x 2 pivot on p, r
+
+            # Step 2: Interchange and recompute the updated pivot column(s)
+            if size == 1:
+                if q != p:
+                    _swap(LD, F, perm, p, q)
+                    column = _trailing_column(LD, F, k0, p, p)
+                d = column[0]
+                F[p:, p - k0] = column
+                LD[p, p] = d
+                LD[p+1:, p] = column[1:] / d if d != 0 else 0.0
+            else:
+                if q != p + 1:
+                    _swap(LD, F, perm, p + 1, q)
+                c0 = _trailing_column(LD, F, k0, p, p)
+                c1 = _trailing_column(LD, F, k0, p, p + 1)
+                F[p:, p - k0] = c0
+                F[p+1:, p + 1 - k0] = c1[1:]
+                F[p, p + 1 - k0] = c1[0]
+                d0, d1, off = c0[0], c1[1], c0[1]
+                det = d0 * d1 - off * off
+                LD[p, p], LD[p + 1, p + 1], e[p] = d0, d1, off
+                LD[p + 1, p] = 0.0                          # L is zero inside the block
+                # [L_r,p  L_r,p+1] = [c0_r  c1_r] D^-1
+                LD[p+2:, p] = (d1 * c0[2:] - off * c1[2:]) / det
+                LD[p+2:, p + 1] = (d0 * c1[2:] - off * c0[2:]) / det
+            p += size
+
+        # Step 3: A22 -= L21 F21^T on the lower triangle, one block column at a time
+        end = p                                 # A 2 x 2 pivot may overrun the panel by one
+        for c0 in range(end, n, block_size):
+            c1 = min(c0 + block_size, n)
+            LD[c0:, c0:c1] -= LD[c0:, k0:end] @ F[c0:c1, :end - k0].T
+        F[:] = 0.0
+        k0 = end
+    return LD, e, perm
+
+
+class CholeskyFactorization(Factorization):
+    """
+    A = L L^T for symmetric positive definite A, stored in one triangle.
+    Half the flops and factor storage of LU; no pivoting is needed.
+
+    Parameters:
+    A           -> symmetric positive definite matrix (n x n)
+    overwrite_a -> factor in A's own buffer (its lower triangle is destroyed)
+
+    Raises ValueError when A is not positive definite.
+    """
+
+    def __init__(self, A, overwrite_a=False):
+        A = np.asarray(A, dtype=float)
+        self.n = A.shape[0]
+        self.norm1 = matrix_norm1(A)
+        a_max = max_abs(A)
+        self.L = cholesky_factor(A, overwrite_a=overwrite_a)
+        if self.L is None:
+            raise ValueError("Matrix is not positive definite.")
+        # Growth of L L^T is bounded by 1: max L_ij^2 <= max A_ii
+        self.growth = float(max_abs(self.L.T, k=0) ** 2 / a_max) if a_max > 0 else 1.0
+        self.singular = False
+
+    def _solve_array(self, b):
+        return self._solve_in_place(self._check_rhs(b).copy())
+
+    def _solve_in_place(self, b):
+        if not _is_buffer(b, np.float64):
+            return self._solve_array(b)
+        self._check_rhs(b)
+        solve_lower(self.L, b, out=b)                   # L y = b
+        return solve_lower(self.L, b, trans=True, out=b)   # L^T x = y
+
+    # A is symmetric: A^T x = b is the same system
+    def _solve_transpose_array(self, b):
+        return self._solve_array(b)
+
+    # log det(A) = 2 * sum(log diag(L)), det > 0
+    def slogdet(self):
+        return 1.0, float(2 * np.sum(np.log(np.diagonal(self.L))))
+
+
+class LDLFactorization(Factorization):
+    """
+    P A P^T = L D L^T for symmetric indefinite A (Bunch-Kaufman pivoting),
+    L and D stored in one triangle plus the sub-diagonal of D.
+
+    Parameters:
+    A           -> symmetric matrix (n x n)
+    overwrite_a -> factor in A's own buffer (its lower triangle is destroyed)
+    """
+
+    def __init__(self, A, overwrite_a=False):
+        A = np.asarray(A, dtype=float)
+        self.n = A.shape[0]
+        self.norm1 = matrix_norm1(A)
+        a_max = max_abs(A)
+        self.LD, self.e, self.perm = ldl_factor(A, overwrite_a=overwrite_a)
+        self.d = np.diagonal(self.LD)
+        self.starts = np.flatnonzero(self.e)        # First index of every 2 x 2 block
+        self.singles = np.ones(self.n, dtype=bool)
+        self.singles[self.starts] = False
+        self.singles[self.starts + 1] = False
+        # Bound on max|D L^T| / max|A|, the analogue of max|U| / max|A|
+        l_max = max(max_abs(self.LD.T, k=1), 1.0)
+        d_max = max(np.max(np.abs(self.d)), np.max(np.abs(self.e), initial=0.0)) if self.n else 0.0
+        self.growth = float(l_max * d_max / a_max) if a_max > 0 else 1.0
+        # 2 x 2 pivots are nonsingular by construction, so only 1 x 1 pivots can be zero
+        self.singular = bool(np.any(self.d[self.singles] == 0))
+
+    # Solve D z = y in place, 1 x 1 and 2 x 2 blocks all at once
+    def _solve_diagonal(self, x):
+        x[self.singles] /= self.d[self.singles][(slice(None),) + (None,) * (x.ndim - 1)]
+        s = self.starts
+        if len(s):
+            shape = (slice(None),) + (None,) * (x.ndim - 1)
+            d0, d1, off = self.d[s][shape], self.d[s + 1][shape], self.e[s][shape]
+            det = d0 * d1 - off * off
+            x0, x1 = x[s], x[s + 1]
+            x[s], x[s + 1] = (d1 * x0 - off * x1) / det, (d0 * x1 - off * x0) / det
+
+    def _solve_array(self, b):
+        x = self._check_rhs(b)[self.perm]           # Apply P (fresh copy of b)
+        solve_lower(self.LD, x, unit_diagonal=True, out=x)
+        self._solve_diagonal(x)
+        solve_lower(self.LD, x, unit_diagonal=True, trans=True, out=x)
+        y = np.empty_like(x)
+        y[self.perm] = x                            # Undo P
+        return y
+
+    # A is symmetric: A^T x = b is the same system
+    def _solve_transpose_array(self, b):
+        return self._solve_array(b)
+
+    # det(A) = prod of the 1 x 1 pivots times the determinants of the 2 x 2 blocks
+    def slogdet(self):
+        s = self.starts
+        dets = np.concatenate((self.d[self.singles],
+                               self.d[s] * self.d[s + 1] - self.e[s] ** 2))
+        sign = float(np.prod(np.sign(dets)))
+        with np.errstate(divide="ignore"):
+            logdet = float(np.sum(np.log(np.abs(dets))))
+        return (sign, logdet) if sign != 0 else (0.0, -np.inf)
+
+
+# Rebuild the lower triangle of a symmetric A from its untouched upper triangle
+def _restore_lower(A, diag, block_size=BLOCK_SIZE):
+    n = A.shape[0]
+    for i0 in range(0, n, block_size):
+        i1 = min(i0 + block_size, n)
+        A[i1:, i0:i1] = A[i0:i1, i1:].T
+        block = A[i0:i1, i0:i1]
+        block[...] = np.triu(block, 1).T + np.triu(block, 1)
+    A[np.diag_indices(n)] = diag
+
+
+# Cholesky when A is positive definite, else LDL^T (or None without pivoting)
+def symmetric_factorize(A, pivot=True, overwrite_a=False):
+    A = np.asarray(A, dtype=float)
+    diag = np.diagonal(A).copy()
+    if np.all(diag > 0):                        # Necessary for positive definiteness
+        try:
+            return CholeskyFactorization(A, overwrite_a=overwrite_a)
+        except ValueError:
+            if overwrite_a and _is_buffer(A, np.float64):
+                _restore_lower(A, diag)         # Failed attempt overwrote the lower triangle
+    return LDLFactorization(A, overwrite_a=overwrite_a) if pivot else None
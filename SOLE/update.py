@@ -0,0 +1,186 @@
+import numpy as np
+from factorization import Factorization, LUFactorization
+from structure import factorize
+
+# Refactor after this many accumulated rank-1 terms ...
+MAX_UPDATE_RANK = 32
+# ... or once the update system becomes this badly conditioned
+STABILITY_LIMIT = 1e8
+
+
+class _LowRankUpdates:
+    """
+    Row / column / entry changes expressed as rank-1 updates A += u v^T.
+    Subclasses keep the current matrix in self.A and implement update(u, v).
+    """
+
+    # A[i, j] += delta
+    def update_entry(self, i, j, delta):
+        u = np.zeros(self.n)
+        v = np.zeros(self.n)
+        u[i], v[j] = 1.0, delta
+        self.update(u, v)
+
+    # Replace row i of A
+    def update_row(self, i, new_row):
+        u = np.zeros(self.n)
+        u[i] = 1.0
+        self.update(u, np.asarray(new_row, dtype=float) - self.A[i])
+
+    # Replace column j of A
+    def update_column(self, j, new_column):
+        v = np.zeros(self.n)
+        v[j] = 1.0
+        self.update(np.asarray(new_column, dtype=float) - self.A[:, j], v)
+
+
+class UpdatableFactorization(_LowRankUpdates, Factorization):
+    """
+    Factorization of A that absorbs low-rank changes A += U V^T in O(n^2)
+    per rank-1 term, using the Sherman-Morrison-Woodbury formula
+
+        A^-1 b = A0^-1 b - Z C^-1 V^T A0^-1 b,   Z = A0^-1 U,  C = I + V^T Z
+
+    on top of the factors of the last fully factored matrix A0. Once the
+    accumulated rank reaches max_rank, or C becomes ill-conditioned, the
+    current A is factored again from scratch.
+
+    Parameters:
+    A              -> square coefficient matrix (n x n)
+    max_rank       -> accumulated update rank that triggers a refactorization
+    pivot          -> use partial pivoting in the underlying factorization
+    factorization  -> existing Factorization of A (e.g. from factorize) to
+                      start from; A is then only used for later refactorizations
+    """
+
+    def __init__(self, A, max_rank=MAX_UPDATE_RANK, pivot=True, factorization=None):
+        self.A = np.array(A, dtype=float)
+        self.n = self.A.shape[0]
+        self.max_rank = max_rank
+        self.pivot = pivot
+        self.refactorizations = 0
+        if factorization is not None and factorization.n != self.n:
+            raise ValueError("The factorization does not match the size of A.")
+        self._refactor(factorization)
+
+    # Factor the current A (or adopt given factors of it) and forget the updates
+    def _refactor(self, factorization=None):
+        if factorization is None:
+            factorization = factorize(self.A, pivot=self.pivot)
+            self.refactorizations += 1
+        self.base = factorization
+        self.U = np.zeros((self.n, 0))
+        self.V = np.zeros((self.n, 0))
+        self.Z = np.zeros((self.n, 0))      # A0^-1 U
+        self.W = np.zeros((self.n, 0))      # A0^-T V
+        self.capacitance = None
+        self.singular = self.base.singular
+        self.growth = self.base.growth
+        self.norm1 = self.base.norm1
+
+    @property
+    def rank(self):
+        return self.U.shape[1]
+
+    def update(self, u, v):
+        """
+        Applies A += u v^T with u, v of shape (n,) or (n, k).
+        """
+        u = np.asarray(u, dtype=float).reshape(self.n, -1)
+        v = np.asarray(v, dtype=float).reshape(self.n, -1)
+        self.A += u @ v.T
+        self.norm1 = float(np.max(np.sum(np.abs(self.A), axis=0)))
+
+        if self.base.singular or self.rank + u.shape[1] > self.max_rank:
+            self._refactor()
+            return
+
+        self.U = np.hstack([self.U, u])
+        self.V = np.hstack([self.V, v])
+        self.Z = np.hstack([self.Z, self.base.solve(u)])
+        self.W = np.hstack([self.W, self.base.solve_transpose(v)])
+
+        C = np.eye(self.rank) + self.V.T @ self.Z
+        if not np.linalg.cond(C) < STABILITY_LIMIT:   # Woodbury would lose accuracy
+            self._refactor()
+            return
+        self.capacitance = LUFactorization(C)
+
+    def _solve_array(self, b):
+        x = self.base.solve(self._check_rhs(b))
+        if self.rank:
+            x -= self.Z @ self.capacitance.solve(self.V.T @ x)
+        return x
+
+    # A^T = A0^T + V U^T, whose Woodbury system matrix is C^T
+    def _solve_transpose_array(self, b):
+        x = self.base.solve_transpose(self._check_rhs(b))
+        if self.rank:
+            x -= self.W @ self.capacitance.solve_transpose(self.U.T @ x)
+        return x
+
+
+class UpdatableInverse(_LowRankUpdates):
+    """
+    Explicit inverse of A kept up to date with Sherman-Morrison, O(n^2) per
+    rank-1 change:
+
+        (A + u v^T)^-1 = A^-1 - (A^-1 u)(v^T A^-1) / (1 + v^T A^-1 u)
+
+    After max_updates changes, or when the denominator nearly vanishes, the
+    inverse is recomputed from the current A.
+
+    Parameters:
+    A            -> square matrix (n x n)
+    max_updates  -> rank-1 updates between full recomputations
+    inverse      -> existing inverse of A to start from (the output of
+                    InverseMatrix: an array, a SolveResult or an
+                    InverseOperator); A is then only used for recomputations
+    """
+
+    def __init__(self, A, max_updates=MAX_UPDATE_RANK, inverse=None):
+        self.A = np.array(A, dtype=float)
+        self.n = self.A.shape[0]
+        self.max_updates = max_updates
+        self.refactorizations = 0
+        if inverse is None:
+            self._refactor()
+            return
+        if hasattr(inverse, "todense"):         # InverseOperator
+            inverse = inverse.todense()
+        inverse = np.array(getattr(inverse, "x", inverse), dtype=float)   # SolveResult.x
+        if inverse.shape != (self.n, self.n):
+            raise ValueError("The inverse must be the full n x n inverse of A.")
+        self.inverse = inverse
+        self.updates = 0
+
+    # Recompute the inverse of the current A from its LU factors
+    def _refactor(self):
+        factorization = LUFactorization(self.A)
+        if factorization.singular:
+            raise ValueError("Zero pivot element detected. Matrix is singular.")
+        self.inverse = factorization.solve(np.eye(self.n))
+        self.updates = 0
+        self.refactorizations += 1
+
+    def update(self, u, v):
+        """
+        Applies A += u v^T with u, v of shape (n,) or (n, k), one column
+        pair at a time.
+        """
+        u = np.asarray(u, dtype=float).reshape(self.n, -1)
+        v = np.asarray(v, dtype=float).reshape(self.n, -1)
+        for k in range(u.shape[1]):
+            self.A += np.outer(u[:, k], v[:, k])
+            if self.updates >= self.max_updates:
+                self._refactor()
+                continue
+            Au = self.inverse @ u[:, k]
+            vA = v[:, k] @ self.inverse
+            denominator = 1.0 + v[:, k] @ Au
+            scale = 1.0 + np.abs(vA).sum() * np.abs(u[:, k]).sum()
+            if abs(denominator) <= np.sqrt(np.finfo(float).eps) * scale:
+                self._refactor()        # Nearly singular update: recompute directly
+                continue
+            self.inverse -= np.outer(Au, vA) / denominator
+            self.updates += 1